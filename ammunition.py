@@ -3,6 +3,7 @@ from __future__ import annotations
 from pygame import Vector3
 
 from assets import MineAnimation, SmallBulletImage, SmallMissileImage
+from categories import PROJECTILE
 from controller import PIDHomingController
 from engines import Engine
 from explosions import LargeExplosion, SmallExplosion, explosion_effect
@@ -15,38 +16,39 @@ from objects import (
     HasTimer,
     Moves,
     Object,
+    Pooled,
     StaticDrawable,
 )
-from teams import check_teams
 
 
 class Bullet(Moves, HasMass, Collides, Object):
+    CATEGORY = PROJECTILE
     DRAG = 0.0
     ANGULAR_DRAG = 0.0
     DMG: float
 
     def on_collision(self, other: Object):
-        if check_teams(self, other):
-            if hasattr(other, "apply_damage"):
-                other.apply_damage(self.DMG)
-            self.mark_dead()
+        if hasattr(other, "apply_damage"):
+            other.apply_damage(self.DMG)
+        self.mark_dead()
         super().on_collision(other)
 
     def apply_damage(self, dmg):
         self.mark_dead()
 
 
-class SmallBullet(StaticDrawable, HasTimer, Bullet):
+class SmallBullet(Pooled, StaticDrawable, HasTimer, Bullet):
     MASS = 0.1
     TTL = 3_000
     DMG = 10.0
     IMAGE = SmallBulletImage
 
     def postprocessing(self):
-        pass
+        self.image = self.get_surface().get_image(self.pos.z)
 
 
 class SmallMissile(
+    Pooled,
     StaticDrawable,
     HasEngines,
     Moves,
@@ -55,6 +57,8 @@ class SmallMissile(
     Collides,
     Object,
 ):
+    CATEGORY = PROJECTILE
+    FAST = True
     MASS = 2.0
     DMG = 30.0
     DRAG = 1 / 1000
@@ -77,10 +81,9 @@ class SmallMissile(
         super().update(dt)
 
     def on_collision(self, other: Object):
-        if check_teams(self, other):
-            if hasattr(other, "apply_damage"):
-                other.apply_damage(self.DMG)
-            self.mark_dead()
+        if hasattr(other, "apply_damage"):
+            other.apply_damage(self.DMG)
+        self.mark_dead()
         super().on_collision(other)
 
     def apply_damage(self, dmg):
@@ -93,6 +96,7 @@ class SmallMissile(
 
 
 class Mine(AnimatedDrawable, Collides, Moves, HasHitpoints, HasMass, Object):
+    CATEGORY = PROJECTILE
     DMG = 1000.0
     DRAG = 100 / 1000
     ANGULAR_DRAG = 200 / 1000
@@ -101,11 +105,7 @@ class Mine(AnimatedDrawable, Collides, Moves, HasHitpoints, HasMass, Object):
     MASS = 10.0
 
     def on_collision(self, other: Object):
-        if (
-            isinstance(other, HasHitpoints)
-            and other.HP >= 30
-            and check_teams(self, other)
-        ):
+        if isinstance(other, HasHitpoints) and other.HP >= 30:
             other.apply_damage(self.DMG)
             self.mark_dead()
 
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from functools import cache
+
+import pygame as pg
+
+from logger import logger
+
+CACHE_MAGIC = b"PTYRASSETS"
+CACHE_VERSION = 2
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".asset_cache")
+
+HEADER = struct.Struct(f"<{len(CACHE_MAGIC)}sII")
+
+
+@cache
+def file_digest(filename: str) -> str:
+    with open(filename, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+class AssetCache:
+    # frames are stored as raw BGRA, the layout of SRCALPHA surfaces, so they
+    # are loaded back with a zero-copy pg.image.frombuffer over the mmap
+    path: str
+    index: dict[str, dict]
+    new_surfaces: dict[str, pg.Surface]
+    hits: int
+    misses: int
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        self.index = {}
+        self.new_surfaces = {}
+        self.hits = 0
+        self.misses = 0
+        self._mmap = None
+        self._data_offset = 0
+        self._load()
+
+    def _load(self):
+        try:
+            f = open(self.path, "rb")  # noqa: SIM115
+        except FileNotFoundError:
+            return
+        with f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                return
+            magic, version, index_size = HEADER.unpack(header)
+            if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                logger.info(f"Ignoring {self.path} (version {version}).")
+                return
+            self.index = json.loads(f.read(index_size))
+            self._data_offset = HEADER.size + index_size
+            # copy-on-write, surfaces built on top of it stay writable
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    def _get(self, key: str, sources: tuple[str, ...]) -> dict | None:
+        entry = self.index.get(key)
+        if entry is None or entry["sources"] != [file_digest(s) for s in sources]:
+            return None
+        return entry
+
+    def _put(self, key: str, sources: tuple[str, ...], **entry):
+        self.index[key] = {"sources": [file_digest(s) for s in sources], **entry}
+
+    def lookup(
+        self,
+        key: str,
+        sources: tuple[str, ...],
+    ) -> tuple[pg.Surface, dict | None] | None:
+        entry = self._get(key, sources)
+        if entry is None or "offset" not in entry or self._mmap is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        start = self._data_offset + entry["offset"]
+        buffer = memoryview(self._mmap)[start : start + entry["nbytes"]]
+        surface = pg.image.frombuffer(buffer, tuple(entry["size"]), "BGRA")
+        return surface, entry["metadata"]
+
+    def store(
+        self,
+        key: str,
+        sources: tuple[str, ...],
+        surface: pg.Surface,
+        metadata: dict | None,
+    ):
+        self.new_surfaces[key] = surface
+        self._put(key, sources, size=surface.get_size(), metadata=metadata)
+
+    def save(self):
+        if not self.misses:
+            return
+
+        blobs = []
+        offset = 0
+        for key, entry in self.index.items():
+            if key in self.new_surfaces:
+                blob = pg.image.tobytes(self.new_surfaces[key], "BGRA")
+            else:
+                start = self._data_offset + entry["offset"]
+                blob = self._mmap[start : start + entry["nbytes"]]
+            entry["offset"] = offset
+            entry["nbytes"] = len(blob)
+            offset += len(blob)
+            blobs.append(blob)
+
+        index = json.dumps(self.index).encode()
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(index)))
+                f.write(index)
+                for blob in blobs:
+                    f.write(blob)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.info(f"Unable to write {self.path}: {e}.")
+            return
+        logger.info(f"Baked {self.misses} new assets into {self.path}.")
+
+    def __repr__(self):
+        return f"hits:{self.hits} misses:{self.misses}"
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from typing import NamedTuple
+
+import pygame as pg
+
+import masks
+
+# Only pygame and pure helpers are imported here, so worker processes can
+# build frames without a display.
+
+MIN_PARALLEL_FRAMES = 16
+
+
+class Frame(NamedTuple):
+    loader: str
+    args: tuple
+    pad: bool = False
+    size: tuple[int, int] | None = None
+    cached: bool = True
+
+    @property
+    def filename(self) -> str:
+        return self.args[-1]
+
+
+class Animation(NamedTuple):
+    frames: list[Frame]
+    animation_time: int
+    loops: bool
+
+
+@cache
+def load_image(filename: str) -> pg.Surface:
+    return pg.image.load(filename)
+
+
+def load_full_file(filename: str) -> pg.Surface:
+    image = load_image(filename)
+    ret_surface = pg.Surface(image.get_size(), flags=pg.SRCALPHA)
+    ret_surface.blit(image, (0, 0))
+    return ret_surface
+
+
+def load_from_file(
+    posx: int,
+    posy: int,
+    sizex: int,
+    sizey: int,
+    filename: str,
+) -> pg.Surface:
+    ret_surface = pg.Surface((sizex, sizey), flags=pg.SRCALPHA)
+    image = load_image(filename)
+    ret_surface.blit(image, (0, 0), (posx, posy, sizex, sizey))
+    return remove_background(ret_surface)
+
+
+def load_double_from_file(
+    posx: int,
+    posy: int,
+    sizex: int,
+    sizey: int,
+    filename: str,
+) -> pg.Surface:
+    ret_surface = pg.Surface((2 * sizex, sizey), flags=pg.SRCALPHA)
+    image = load_image(filename)
+    ret_surface.blit(image, (0, 0), (posx, posy, sizex, sizey))
+    ret_surface.blit(image, (sizex, 0), (posx, posy + sizey, sizex, sizey))
+    return remove_background(ret_surface)
+
+
+def load_double_reversed_from_file(
+    posx: int,
+    posy: int,
+    sizex: int,
+    sizey: int,
+    filename: str,
+) -> pg.Surface:
+    ret_surface = pg.Surface((2 * sizex, sizey), flags=pg.SRCALPHA)
+    image = load_image(filename)
+    ret_surface.blit(image, (sizex, 0), (posx, posy, sizex, sizey))
+    ret_surface.blit(image, (0, 0), (posx, posy + sizey, sizex, sizey))
+    return remove_background(ret_surface)
+
+
+def load_quad_from_file(
+    posx: int,
+    posy: int,
+    sizex: int,
+    sizey: int,
+    filename: str,
+) -> pg.Surface:
+    ret_surface = pg.Surface((2 * sizex, 2 * sizey), flags=pg.SRCALPHA)
+    image = load_image(filename)
+    ret_surface.blit(image, (0, 0), (posx, posy, sizex, sizey))
+    ret_surface.blit(image, (sizex, 0), (posx, posy + sizey, sizex, sizey))
+    ret_surface.blit(image, (0, sizey), (posx, posy + 2 * sizey, sizex, sizey))
+    ret_surface.blit(image, (sizex, sizey), (posx, posy + 3 * sizey, sizex, sizey))
+    return remove_background(ret_surface)
+
+
+def pad(surface: pg.Surface) -> pg.Surface:
+    x, y = surface.get_size()
+    ret_surface = pg.Surface((x + 2, y + 2), flags=pg.SRCALPHA)
+    ret_surface.blit(surface, (1, 1))
+    return ret_surface
+
+
+def remove_background(surface: pg.Surface) -> pg.Surface:
+    """In place removal."""
+    pxarray = pg.PixelArray(surface)
+    pxarray.replace((191, 220, 191, 255), (0, 0, 0, 0), 0.001)
+    return surface
+
+
+LOADERS = {
+    "load_full_file": load_full_file,
+    "load_from_file": load_from_file,
+    "load_double_from_file": load_double_from_file,
+    "load_double_reversed_from_file": load_double_reversed_from_file,
+    "load_quad_from_file": load_quad_from_file,
+}
+
+
+def build_frame(frame: Frame) -> tuple[bytes, tuple[int, int], dict | None]:
+    surface = LOADERS[frame.loader](*frame.args)
+    if frame.pad:
+        surface = pad(surface)
+    if frame.size is not None:
+        surface = pg.transform.scale(surface, frame.size)
+    metadata = None
+    if frame.cached:
+        metadata = masks.mask_metadata(pg.mask.from_surface(surface))
+    return pg.image.tobytes(surface, "BGRA"), surface.get_size(), metadata
+
+
+def frame_sources(frame: Frame) -> tuple[str, ...]:
+    return frame.filename, __file__, masks.__file__
+
+
+def build_frames(
+    frames: list[Frame],
+    workers: int,
+) -> list[tuple[bytes, tuple[int, int], dict | None]]:
+    if workers > 1 and len(frames) >= MIN_PARALLEL_FRAMES:
+        with ProcessPoolExecutor(workers) as pool:
+            return list(
+                pool.map(build_frame, frames, chunksize=len(frames) // workers + 1),
+            )
+    return [build_frame(frame) for frame in frames]
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from asset_pipeline import Animation, Frame
+from config import CONFIG
+
+
+def load_from_file(*args) -> Frame:
+    return Frame("load_from_file", args)
+
+
+def load_double_from_file(*args) -> Frame:
+    return Frame("load_double_from_file", args)
+
+
+def load_double_reversed_from_file(*args) -> Frame:
+    return Frame("load_double_reversed_from_file", args)
+
+
+def load_quad_from_file(*args) -> Frame:
+    return Frame("load_quad_from_file", args)
+
+
+def pad(frame: Frame) -> Frame:
+    return frame._replace(pad=True)
+
+
+PlayerImages = [
+    pad(
+        load_from_file(
+            48,
+            58 + i * 27,
+            24,
+            27,
+            "assets/tyrian/tyrian.shp.007D3C.png",
+        ),
+    )
+    for i in range(6)
+]
+AsteroidLargeImages = [
+    pad(load_from_file(2, 4, 42, 46, "assets/tyrian/newshd.shp.000000.png")),
+    pad(load_from_file(79, 4, 40, 50, "assets/tyrian/newshd.shp.000000.png")),
+]
+
+AsteroidMediumImages = [
+    pad(load_from_file(50, 1, 22, 20, "assets/tyrian/newshd.shp.000000.png")),
+    pad(load_from_file(48, 29, 21, 23, "assets/tyrian/newshd.shp.000000.png")),
+    pad(load_from_file(96, 57, 24, 25, "assets/tyrian/newshd.shp.000000.png")),
+    pad(load_from_file(97, 86, 23, 23, "assets/tyrian/newshd.shp.000000.png")),
+    pad(load_from_file(194, 57, 22, 20, "assets/tyrian/newshd.shp.000000.png")),
+]
+
+AsteroidSmallImages = [
+    pad(load_from_file(216, 56, 12, 14, "assets/tyrian/newshd.shp.000000.png")),
+    pad(load_from_file(216, 70, 12, 14, "assets/tyrian/newshd.shp.000000.png")),
+    pad(load_from_file(216, 85, 12, 12, "assets/tyrian/newshd.shp.000000.png")),
+    pad(load_from_file(216, 98, 12, 15, "assets/tyrian/newshd.shp.000000.png")),
+]
+
+BackgroundImage = Frame(
+    "load_full_file",
+    ("assets/background.jpg",),
+    size=(CONFIG.WORLD_WIDTH, CONFIG.WORLD_HEIGHT),
+    cached=False,
+)
+
+SmallBulletImage = load_from_file(
+    183,
+    74,
+    5,
+    5,
+    "assets/tyrian/newsh(.shp.000000.png",
+)
+
+SmallMissileImage = load_from_file(
+    159,
+    29,
+    7,
+    12,
+    "assets/tyrian/tyrian.shp.000000.png",
+)
+
+MediumExplosionAnimation = Animation(
+    [
+        load_quad_from_file(
+            0 + 12 * i,
+            126,
+            12,
+            14,
+            "assets/tyrian/tyrian.shp.01D8A7.png",
+        )
+        for i in range(11)
+    ],
+    animation_time=800,
+    loops=False,
+)
+
+LargeExplosionAnimation1 = Animation(
+    [
+        load_double_from_file(
+            0 + 12 * i,
+            -2,
+            12,
+            28,
+            "assets/tyrian/newsh6.shp.000000.png",
+        )
+        for i in range(17)
+    ],
+    animation_time=800,
+    loops=False,
+)
+
+LargeExplosionAnimation2 = Animation(
+    [
+        load_double_reversed_from_file(
+            0 + 12 * i,
+            112,
+            12,
+            28,
+            "assets/tyrian/newsh6.shp.000000.png",
+        )
+        for i in range(13)
+    ],
+    animation_time=800,
+    loops=False,
+)
+
+MineAnimation = Animation(
+    [
+        load_from_file(
+            192,
+            113 + 28 * i,
+            22,
+            22,
+            "assets/tyrian/newsha.shp.000000.png",
+        )
+        for i in range(3)
+    ],
+    animation_time=3_000,
+    loops=True,
+)
+
+HealPowerupImage = pad(
+    load_from_file(171, 115, 19, 22, "assets/tyrian/newsh1.shp.000000.png"),
+)
+
+SingleShotWeaponImage = pad(
+    load_from_file(170, 143, 20, 21, "assets/tyrian/tyrian.shp.010008.png"),
+)
+
+DoubleShotWeaponImage = pad(
+    load_from_file(194, 143, 20, 21, "assets/tyrian/tyrian.shp.010008.png"),
+)
+
+MineLauncherWeaponImage = pad(
+    load_from_file(2, 199, 20, 21, "assets/tyrian/tyrian.shp.010008.png"),
+)
+
+MissileLauncherWeaponImage = pad(
+    load_from_file(74, 171, 20, 21, "assets/tyrian/tyrian.shp.010008.png"),
+)
+
+LaserWeaponImage = pad(
+    load_from_file(74, 115, 20, 21, "assets/tyrian/tyrian.shp.010008.png"),
+)
+
+LaserShardImage = load_from_file(
+    39,
+    210,
+    7,
+    12,
+    "assets/tyrian/tyrian.shp.000000.png",
+)
+
+RightArrowImage = load_from_file(
+    176,
+    196,
+    16,
+    21,
+    "assets/tyrian/newsh1.shp.000000.png",
+)._replace(size=(CONFIG.WORLD_WIDTH / 20, CONFIG.WORLD_HEIGHT / 20), cached=False)
+
+GeometricEnemyAnimation = Animation(
+    [
+        pad(
+            load_from_file(
+                3 + (27 - 3) * i,
+                58,
+                19,
+                21,
+                "assets/tyrian/newshg.shp.000000.png",
+            ),
+        )
+        for i in range(9)
+    ]
+    + [
+        pad(
+            load_from_file(
+                3 + (27 - 3) * i,
+                85,
+                19,
+                21,
+                "assets/tyrian/newshg.shp.000000.png",
+            ),
+        )
+        for i in range(3)
+    ],
+    800,
+    True,
+)
@@ -0,0 +1,91 @@
+"""Compare the broadphase backends on sparse, dense and mixed-size scenes.
+
+Usage: python benchmark_broadphase.py [frames]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from time import perf_counter
+
+import pygame as pg
+
+from config import CONFIG
+from math_utils import torus_offsets
+from spatial import BROADPHASES
+from timers import pprint
+
+
+class Box:
+    def __init__(self, size: int):
+        self.rect = pg.Rect(
+            random.randrange(CONFIG.WORLD_WIDTH) - size // 2,
+            random.randrange(CONFIG.WORLD_HEIGHT) - size // 2,
+            size,
+            size,
+        )
+        self.speed = (random.randint(-3, 3), random.randint(-3, 3))
+
+    def step(self) -> pg.Rect:
+        old_rect = self.rect
+        center = (
+            (old_rect.centerx + self.speed[0]) % CONFIG.WORLD_WIDTH,
+            (old_rect.centery + self.speed[1]) % CONFIG.WORLD_HEIGHT,
+        )
+        self.rect = old_rect.copy()
+        self.rect.center = center
+        return old_rect
+
+
+SCENES = {
+    "sparse": lambda: [Box(20) for _ in range(200)],
+    "dense": lambda: [Box(20) for _ in range(2000)],
+    "mixed": lambda: [Box(random.choice((4, 4, 4, 20, 20, 120))) for _ in range(1000)],
+}
+
+
+def brute_force_pairs(boxes: list[Box]) -> set[tuple[int, int]]:
+    ret = set()
+    for i, a in enumerate(boxes):
+        for b in boxes[i + 1 :]:
+            for dx, dy in torus_offsets(a.rect):
+                if a.rect.move(dx, dy).colliderect(b.rect):
+                    ret.add((id(a), id(b)) if id(a) < id(b) else (id(b), id(a)))
+            for dx, dy in torus_offsets(b.rect):
+                if b.rect.move(dx, dy).colliderect(a.rect):
+                    ret.add((id(a), id(b)) if id(a) < id(b) else (id(b), id(a)))
+    return ret
+
+
+def run(name: str, scene: str, frames: int):
+    random.seed(0)
+    boxes = SCENES[scene]()
+    broadphase = BROADPHASES[name](*boxes)
+    pairs = 0
+    started = perf_counter()
+    for _ in range(frames):
+        for box in boxes:
+            old_rect = box.step()
+            broadphase.move(box, box.rect, old_rect)
+        pairs += len(broadphase.pairs())
+    elapsed = perf_counter() - started
+
+    found = {(id(a), id(b)) for a, b, _ in broadphase.pairs()}
+    expected = brute_force_pairs(boxes)
+    status = "ok" if found == expected else f"MISMATCH {len(found)}/{len(expected)}"
+    print(
+        f"{scene:>7} {name:>9}: {pprint(elapsed / frames)}/frame,"
+        f" {pairs / frames:.1f} pairs/frame, {status}",
+    )
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    for scene in SCENES:
+        for name in BROADPHASES:
+            run(name, scene, frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from config import CONFIG
+from teams import get_team
+
+if TYPE_CHECKING:
+    from objects import Collides
+
+# Collision categories, one bit each. Pairs are filtered by these before any
+# rect or mask test.
+PARTICLE = 1 << 0
+PROJECTILE = 1 << 1
+SHIP = 1 << 2
+ASTEROID = 1 << 3
+ALL = PARTICLE | PROJECTILE | SHIP | ASTEROID
+
+# kept symmetric, a pair is only looked up from one side
+COLLIDES_WITH = {
+    PARTICLE: ALL & ~PARTICLE,
+    PROJECTILE: ALL,
+    SHIP: ALL,
+    ASTEROID: ALL,
+}
+
+# these pass through everything of their own team
+TEAM_FILTERED = PARTICLE | PROJECTILE
+
+
+def can_collide(a: Collides, b: Collides) -> bool:
+    if not COLLIDES_WITH[a.CATEGORY] & b.CATEGORY:
+        return False
+    if (a.CATEGORY | b.CATEGORY) & TEAM_FILTERED and CONFIG.MODE != "all_dmg":
+        return get_team(a) != get_team(b)
+    return True
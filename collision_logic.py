@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 import math
-import random
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 import pygame as pg
 from pygame import Vector2, Vector3
@@ -12,32 +11,13 @@ if TYPE_CHECKING:
     from players import Player
     from powerups import PowerUp
 
+from math_utils import separating_axis
 
-def sample_from_mask(mask: pg.Mask):
-    br = bounding_rect(mask)
-    cnt = mask.count()
 
-    while br.width > 1 or br.height > 1:
-        if br.width > br.height:
-            midpoint = (br.left + br.right) // 2
-            submask = pg.Mask((midpoint - br.left, br.height), fill=True)
-        else:
-            midpoint = (br.top + br.bottom) // 2
-            submask = pg.Mask((br.width, midpoint - br.top), fill=True)
-        sub_cnt = mask.overlap_area(submask, br.topleft)
-        if random.uniform(0, 1) < sub_cnt / cnt:
-            mask = mask.overlap_mask(submask, br.topleft)
-        else:
-            mask.erase(submask, br.topleft)
-        br = bounding_rect(mask)
-        cnt = mask.count()
-
-    return Vector2(br.x, br.y)
-
-
-def bounding_rect(mask: pg.Mask) -> pg.Rect:
-    bounding_rects = mask.get_bounding_rects()
-    return bounding_rects[0].unionall(bounding_rects[1:])
+class Contact(NamedTuple):
+    point: Vector2
+    normal: Vector2  # unit, pointing from b towards a
+    depth: float
 
 
 def get_collision_point(a: DrawableObject, b: DrawableObject) -> Vector2:
@@ -45,7 +25,36 @@ def get_collision_point(a: DrawableObject, b: DrawableObject) -> Vector2:
     y_diff = b.rect.y - a.rect.y
     overlap_mask: pg.Mask = a.mask.overlap_mask(b.mask, (x_diff, y_diff))
 
-    return sample_from_mask(overlap_mask) + Vector2(a.rect.x, a.rect.y)
+    return Vector2(overlap_mask.centroid()) + Vector2(a.rect.x, a.rect.y)
+
+
+def get_hull_contact(a: DrawableObject, b: DrawableObject) -> Contact | None:
+    # separating axis test of the convex hulls, None when they are apart
+    ax, ay = a.pos.x, a.pos.y
+    bx, by = b.pos.x, b.pos.y
+    hull_a, axes_a = a.get_surface().get_hull(a.pos.z)
+    hull_b, axes_b = b.get_surface().get_hull(b.pos.z)
+    if not hull_a or not hull_b:
+        return None
+    points_a = [(ax + x, ay + y) for x, y in hull_a]
+    points_b = [(bx + x, by + y) for x, y in hull_b]
+    found = separating_axis(points_a, axes_a, points_b, axes_b)
+    if found is None:
+        return None
+    depth, (nx, ny) = found
+    if (ax - bx) * nx + (ay - by) * ny < 0:
+        nx, ny = -nx, -ny
+
+    # b's vertices deepest into a, halfway back to a's surface
+    proj = [x * nx + y * ny for x, y in points_b]
+    top = max(proj)
+    deepest = [p for p, d in zip(points_b, proj) if d > top - 1]
+    point = Vector2(
+        sum(x for x, _ in deepest) / len(deepest),
+        sum(y for _, y in deepest) / len(deepest),
+    )
+    normal = Vector2(nx, ny)
+    return Contact(point - normal * depth / 2, normal, depth)
 
 
 def collide_objects(
@@ -53,6 +62,7 @@ def collide_objects(
     b: Collides,
     collision_point: Vector2,
     elasticity=0.75,
+    normal: Vector2 | None = None,
 ) -> float:
     a_r: Vector2 = collision_point - a.pos_xy
     b_r: Vector2 = collision_point - b.pos_xy
@@ -62,12 +72,14 @@ def collide_objects(
 
     local_speed_diff = a_local_speed - b_local_speed
 
-    a_r_n = a_r.normalize() if a_r != Vector2() else Vector2()
-    b_r_n = b_r.normalize() if b_r != Vector2() else Vector2()
+    if normal is None:
+        # guessed from the directions to the centroids
+        a_r_n = a_r.normalize() if a_r != Vector2() else Vector2()
+        b_r_n = b_r.normalize() if b_r != Vector2() else Vector2()
 
-    normal = b_r_n * 1.01 - a_r_n
-    if normal != Vector2():
-        normal = normal.normalize()
+        normal = b_r_n * 1.01 - a_r_n
+        if normal != Vector2():
+            normal = normal.normalize()
 
     if normal * local_speed_diff >= 0:
         return 0.0
@@ -115,14 +127,22 @@ def collide_objects(
     return B**2 / A
 
 
-def _colliding_colliding_logic(obj_a: Collides, obj_b: Collides):
-    if id(obj_b) < id(obj_a):
-        return
+def _colliding_colliding_logic(
+    obj_a: Collides,
+    obj_b: Collides,
+    collision_point: Vector2 | None = None,
+    normal: Vector2 | None = None,
+):
     obj_a.on_collision(obj_b)
     obj_b.on_collision(obj_a)
-    for _ in range(10):
+    # the contact point does not move while the impulses are resolved
+    if collision_point is None:
         collision_point = get_collision_point(obj_a, obj_b)
-        energy = collide_objects(obj_a, obj_b, collision_point)
+    for _ in range(10):
+        energy = collide_objects(obj_a, obj_b, collision_point, normal=normal)
+        if not energy:
+            # separating (or resting) along the normal
+            break
         if hasattr(obj_a, "apply_damage"):
             obj_a.apply_damage(100 * energy)
         if hasattr(obj_b, "apply_damage"):
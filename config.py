@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+
 import pygame as pg
 
 
@@ -12,10 +14,36 @@ class Config:
     WORLD_HEIGHT = 900
     NUM_OF_PLAYERS = 2
     _NUM_OF_PLAYERS = [1, 2, 3, 4]
-    RESOLUTION = pg.display.list_modes()[0]
-    _RESOLUTION = pg.display.list_modes()
+    RESOLUTION: tuple[int, int] | None = None  # resolved by init_display()
     MODE = "pvp"
     _MODE = ["pvp", "coop", "all_dmg"]
+    PRESENTATION = "dirty"
+    _PRESENTATION = ["dirty", "full"]
+    DIRTY_AREA_THRESHOLD = 0.5
+    ROTATION_CACHE_BUDGET = 64 * 2**20
+    ROTATION_STEPS = 360
+    ASSET_WORKERS = os.cpu_count() or 1
+    PHYSICS_HZ = 120
+    _PHYSICS_HZ = [120, 240, 60, 0]  # 0 steps physics once per rendered frame
+    MAX_SUBSTEPS = 5
+    POINT_COLLIDER_SIZE = 5
+    POOL_SIZE = 1024  # free instances kept per pooled class
+    OCCUPANCY = "auto"
+    _OCCUPANCY = ["auto", "on", "off"]
+    OCCUPANCY_MIN_POINTS = 32  # point colliders before "auto" stamps the world
+    NARROWPHASE = "mask"
+    _NARROWPHASE = ["mask", "hull"]  # hulls only between HULL colliders
+    BROADPHASE = "grid"
+    _BROADPHASE = ["grid", "sap", "quadtree"]
+    RK_ORDER = 2
+    _RK_ORDER = [1, 2, 4]
+    HEADLESS = os.environ.get("PTYR_HEADLESS", "").lower() in {"1", "true", "yes"}
+    HEADLESS_FRAMES = 3600
+    HEADLESS_DT = 1000 / 60
+
+    @property
+    def _RESOLUTION(self) -> list[tuple[int, int]]:
+        return pg.display.list_modes()
 
     def bump_option(self, name: str):
         val = getattr(self, name)
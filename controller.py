@@ -1,14 +1,12 @@
 from __future__ import annotations
 
-import math
 from typing import TYPE_CHECKING
 
 import pygame as pg
 from pygame import Vector2
 
-from consts import ALL_SHIFTS
 from groups import ALL_PLAYERS
-from math_utils import internal_coord_to_xy
+from math_utils import internal_coord_to_xy, torus_delta
 
 if TYPE_CHECKING:
     from objects import Object
@@ -33,28 +31,25 @@ class StabilizerController(Controller):
 
 class PIDHomingController(Controller):
     def update(self, dt: float):
-        for player in ALL_PLAYERS:
-            if player != self.controlled.owner:
-                target = player
-                break
-        else:
+        nearest = ALL_PLAYERS.spatial.nearest(
+            self.controlled.pos_xy,
+            predicate=lambda player: player != self.controlled.owner,
+        )
+        if not nearest:
             self.controlled.back_engine.active = 0
             self.controlled.back_left_engine.active = 0
             self.controlled.back_right_engine.active = 0
             return
+        [(target, _)] = nearest
 
-        best = math.inf, None
-        for shift in ALL_SHIFTS:
-            score = pg.Vector2.distance_to(
-                self.controlled.pos_xy
-                + self.controlled.speed_xy * 1000
-                + internal_coord_to_xy(Vector2(0, 100), self.controlled.pos.z),
-                target.pos_xy + shift,
-            )
-            best = min(best, (score, shift))
-        _, best_shift = best
-
-        target_vector = target.pos_xy + best_shift - self.controlled.pos_xy
+        # aim at the copy of the target nearest to where the missile is heading
+        heading = (
+            self.controlled.pos_xy
+            + self.controlled.speed_xy * 1000
+            + internal_coord_to_xy(Vector2(0, 100), self.controlled.pos.z)
+        )
+        target_vector = heading + torus_delta(heading, target.pos_xy)
+        target_vector -= self.controlled.pos_xy
         target_vector = target_vector.normalize()
         speed_vector = (self.controlled.speed_xy - target.speed_xy).normalize()
         ang = 270 - (target_vector + 2 * (target_vector - speed_vector)).as_polar()[1]
@@ -1,25 +1,114 @@
 from __future__ import annotations
 
+import math
+import os
+
 import pygame as pg
 
-from timers import Timer
+from config import CONFIG
+from timers import TIMERS, startup_timer
 
-with Timer("pg.init()"):
-    pg.init()
 
-from config import CONFIG
+class Presenter:
+    full_redraw: bool
+
+    def __init__(self):
+        self.full_redraw = True
+
+    def present(self, dirty: list[pg.Rect]):
+        if self.full_redraw or CONFIG.PRESENTATION == "full":
+            self.present_full()
+            return
+
+        rects = merge_rects(dirty)
+        area = sum(rect.w * rect.h for rect in rects)
+        world_area = CONFIG.WORLD_WIDTH * CONFIG.WORLD_HEIGHT
+        if area > CONFIG.DIRTY_AREA_THRESHOLD * world_area:
+            self.present_full()
+            return
+
+        display = pg.display.get_surface()
+        display_w, display_h = display.get_size()
+        scale_x = display_w / CONFIG.WORLD_WIDTH
+        scale_y = display_h / CONFIG.WORLD_HEIGHT
+        world_rect = DISPLAYSURF.get_rect()
+        display_rect = display.get_rect()
+
+        updated = []
+        with TIMERS["screen_blit"]:
+            for rect in rects:
+                rect = rect.inflate(2, 2).clip(world_rect)
+                if not rect:
+                    continue
+                target = pg.Rect(
+                    math.floor(rect.left * scale_x),
+                    math.floor(rect.top * scale_y),
+                    0,
+                    0,
+                )
+                target.w = math.ceil(rect.right * scale_x) - target.x
+                target.h = math.ceil(rect.bottom * scale_y) - target.y
+                target = target.clip(display_rect)
+                if not target:
+                    continue
+                pg.transform.scale(
+                    DISPLAYSURF.subsurface(rect),
+                    target.size,
+                    display.subsurface(target),
+                )
+                updated.append(target)
+
+        with TIMERS["flip"]:
+            pg.display.update(updated)
+
+    def present_full(self):
+        with TIMERS["screen_blit"]:
+            display = pg.display.get_surface()
+            display_size = display.get_size()
+            pg.transform.scale(DISPLAYSURF, display_size, display)
+
+        with TIMERS["flip"]:
+            pg.display.flip()
+
+        self.full_redraw = False
+
+
+def merge_rects(rects: list[pg.Rect]) -> list[pg.Rect]:
+    merged: list[pg.Rect] = []
+    for rect in rects:
+        idx = rect.collidelist(merged)
+        while idx != -1:
+            rect = rect.union(merged.pop(idx))
+            idx = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+PRESENTER = Presenter()
 
 
 def set_mode():
-    with Timer("pg.display.set_mode()"):
+    with startup_timer("pg.display.set_mode()"):
         pg.display.set_mode(
             CONFIG.RESOLUTION,
             flags=pg.FULLSCREEN | pg.SRCALPHA | pg.SCALED,
             vsync=1,
         )
+    PRESENTER.full_redraw = True
+
 
+def init_display():
+    if CONFIG.HEADLESS:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    with startup_timer("pg.init()"):
+        pg.init()
+    if CONFIG.HEADLESS:
+        return
+    if CONFIG.RESOLUTION is None:
+        CONFIG.RESOLUTION = pg.display.list_modes()[0]
+    set_mode()
 
-set_mode()
 
 DISPLAYSURF = pg.Surface((CONFIG.WORLD_WIDTH, CONFIG.WORLD_HEIGHT), flags=pg.SRCALPHA)
 
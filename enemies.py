@@ -10,6 +10,7 @@ from assets import (
     AsteroidSmallImages,
     GeometricEnemyAnimation,
 )
+from categories import ASTEROID, SHIP
 from config import CONFIG
 from explosions import SmallExplosion
 from groups import ALL_ENEMIES, try_and_spawn_object
@@ -37,6 +38,8 @@ class GeometricEnemy(
     Collides,
     Object,
 ):
+    CATEGORY = SHIP
+    HULL = True
     DRAG = 1 / 1000
     ANGULAR_DRAG = 2 / 1000
 
@@ -51,6 +54,7 @@ class GeometricEnemy(
 
 
 class Asteroid(Moves, HasHitpoints, HasMass, DrawsUI, Collides, Object):
+    CATEGORY = ASTEROID
     DRAG = 0.0
     ANGULAR_DRAG = 0.0
 
@@ -59,6 +63,7 @@ class Asteroid(Moves, HasHitpoints, HasMass, DrawsUI, Collides, Object):
 
 
 class LargeAsteroid(StaticDrawable, Asteroid):
+    HULL = True
     MASS = 100.0
     HP = 100.0
     IMAGE = AsteroidLargeImages
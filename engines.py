@@ -9,7 +9,7 @@ from pygame import Vector2, Vector3
 
 from groups import ALL_WITH_UPDATE
 from math_utils import internal_coord_to_xy
-from particles import Particle
+from particles import PARTICLES
 
 if TYPE_CHECKING:
     from objects import Object
@@ -50,18 +50,8 @@ class Engine(pg.sprite.Sprite):
                 self.owner.pos.z,
             )
 
-            Particle(
-                init_pos=self.owner.pos
-                + Vector3(
-                    posxy.x,
-                    posxy.y,
-                    0.0,
-                ),
-                init_speed=self.owner.speed
-                + Vector3(
-                    speedxy.x,
-                    speedxy.y,
-                    0.0,
-                ),
-                ttl=random.uniform(100, 200),
+            PARTICLES.emit(
+                self.owner.pos_xy + posxy,
+                self.owner.speed_xy + speedxy,
+                random.uniform(100, 200),
             )
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import random
+from functools import cache
+from typing import TYPE_CHECKING
 
+import pygame as pg
 from pygame import Vector2, Vector3
 
 from assets import (
@@ -9,10 +12,13 @@ from assets import (
     LargeExplosionAnimation2,
     MediumExplosionAnimation,
 )
-from groups import try_and_spawn_object
-from objects import AnimatedDrawable, Collides, HasMass, HasTimer, Moves, Object
+from groups import ALL_COLLIDING_OBJECTS, try_and_spawn_object
+from objects import AnimatedDrawable, HasMass, HasTimer, Moves, Object, Pooled
 from particles import CollidingParticle
 
+if TYPE_CHECKING:
+    from surface import CachedAnimation
+
 
 def explosion_effect(
     owner: Object,
@@ -43,16 +49,46 @@ def explosion_effect(
     try_and_spawn_object(_tmp, particles, 2 * particles)
 
 
-class Explosion(AnimatedDrawable, HasTimer, Collides, Moves, HasMass, Object):
+@cache
+def animation_radius(animation: CachedAnimation) -> float:
+    return max(frame.get_mask_metadata().radius for frame in animation.images)
+
+
+class Explosion(Pooled, AnimatedDrawable, HasTimer, Moves, HasMass, Object):
+    # a visual only, its push and damage are applied once by blast()
     DRAG = 0.0
     ANGULAR_DRAG = 0.0
+    BLAST_SPEED = 0.1
 
     def __init__(self, *args, owner, **kwargs):
         super().__init__(*args, owner=owner, mass=owner.mass, **kwargs)
         assert self.ttl == self._image.animation_time
+        self.blast()
+
+    @property
+    def blast_radius(self) -> float:
+        return animation_radius(self._image)
+
+    def blast(self):
+        # hit like an elastic body of the explosion's mass moving out at
+        # BLAST_SPEED, falling off linearly to the edge of the largest frame
+        radius = self.blast_radius
+        pos = self.pos_xy
+        rect = pg.Rect(pos.x - radius, pos.y - radius, 2 * radius + 1, 2 * radius + 1)
+        for obj, shift in ALL_COLLIDING_OBJECTS.spatial.query(rect):
+            delta = obj.pos_xy - pos - Vector2(shift)
+            distance = delta.length()
+            falloff = 1 - max(distance - obj.metadata.radius, 0) / radius
+            if falloff <= 0 or not distance:
+                continue
+            dspeed = 2 * self.mass / (self.mass + obj.mass) * self.BLAST_SPEED * falloff
+            obj.speed += Vector3(*delta * (dspeed / distance), 0)
+            if hasattr(obj, "apply_damage"):
+                # energy to damage as in collisions
+                obj.apply_damage(100 * obj.mass * dspeed**2 / 2)
 
     def postprocessing(self):
-        pass
+        self.image = self.get_surface().get_image(self.pos.z)
 
 
 class LargeExplosion(Explosion):
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+import pygame as pg
+
+from assets import BackgroundImage
+from collision_logic import (
+    _colliding_colliding_logic,
+    _player_powerup_logic,
+)
+from config import CONFIG
+from display import ALL_CHANGES_DISPLAYSURF, DISPLAYSURF, PRESENTER
+from game_logic import init_game_state
+from groups import (
+    ALL_COLLIDING_OBJECTS,
+    ALL_DRAWABLE_OBJECTS,
+    ALL_FAST_COLLIDERS,
+    ALL_PLAYERS,
+    ALL_POINT_COLLIDERS,
+    ALL_POWERUPS,
+    ALL_UI_DRAWABLE_OBJECTS,
+    ALL_WITH_UPDATE,
+)
+from logger import logger
+from menu import MENU_STACK, init_menu
+from particles import PARTICLES
+from pools import POOLS, recycle_pools
+from surface import ROTATION_CACHE
+from text import display_text
+from timers import TIMERS, Timer, pprint
+
+if TYPE_CHECKING:
+    from objects import Object
+
+
+class Game:
+    def __init__(self):
+        self.FramePerSec = pg.time.Clock()
+        self.done = False
+        self.cnt = 0
+        self.object_count = defaultdict(int)
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+        pg.display.set_caption("Project Iapetus")
+        DISPLAYSURF.blit(BackgroundImage, (0, 0))
+        init_game_state()
+
+    def event_loop(self):
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                self.done = True
+            elif event.type == pg.KEYDOWN:
+                if MENU_STACK:
+                    if event.key == pg.K_ESCAPE:
+                        MENU_STACK.pop()
+                    elif event.key == pg.K_UP:
+                        MENU_STACK[-1].up()
+                    elif event.key == pg.K_DOWN:
+                        MENU_STACK[-1].down()
+                    elif event.key == pg.K_RETURN:
+                        MENU_STACK[-1].take_action()
+                else:
+                    if event.key == pg.K_ESCAPE:
+                        MENU_STACK.append(init_menu())
+
+    def stats(self):
+        self.cnt += 1
+        for t in TIMERS.values():
+            t.click()
+        if TIMERS["TOTAL"].val >= 10:
+            for k, v in sorted(TIMERS.items(), key=lambda x: x[1].val, reverse=True):
+                logger.info(f"{k}:{v}")
+            logger.info(
+                " ".join(
+                    f"{k}:{v / self.cnt:.1f}" for k, v in self.object_count.items()
+                ),
+            )
+            logger.info(f"rotation cache: {ROTATION_CACHE}")
+            ROTATION_CACHE.reset_stats()
+            for pool in POOLS:
+                if pool.live or pool.created or pool.reused:
+                    logger.info(f"pool: {pool}")
+                pool.reset_stats()
+            for t in TIMERS.values():
+                t.reset()
+            self.cnt = 0
+            self.object_count = defaultdict(int)
+
+    def updates(self, dt: float):
+        with TIMERS["updates:ParticleSystem"]:
+            PARTICLES.update(dt)
+            self.object_count["ParticleSystem"] += len(PARTICLES)
+        for sprite in ALL_WITH_UPDATE:
+            with TIMERS[f"updates:{sprite.__class__.__qualname__}"]:
+                sprite.update(dt)
+                self.object_count[sprite.__class__.__qualname__] += 1
+        for sprite in ALL_WITH_UPDATE:
+            if hasattr(sprite, "alive_state") and not sprite.alive_state:
+                sprite.kill()
+                sprite.on_death()
+        recycle_pools()
+
+    @staticmethod
+    def collisions():
+        ALL_COLLIDING_OBJECTS.collide_pairs(on_collision=_colliding_colliding_logic)
+        ALL_COLLIDING_OBJECTS.collide_swept(
+            ALL_FAST_COLLIDERS,
+            on_collision=_colliding_colliding_logic,
+        )
+        ALL_COLLIDING_OBJECTS.collide_points(
+            ALL_POINT_COLLIDERS,
+            on_collision=_colliding_colliding_logic,
+        )
+        for player in ALL_PLAYERS:
+            ALL_POWERUPS.collide_with_callback(
+                player,
+                on_collision=_player_powerup_logic,
+            )
+
+    def main(self):
+        while not self.done:
+            with TIMERS["TOTAL"]:
+                self.loop_step()
+
+            self.stats()
+
+    def run_headless(self, frames: int, dt: float):
+        with Timer() as timer:
+            for _ in range(frames):
+                if self.done:
+                    break
+                with TIMERS["TOTAL"]:
+                    self.event_loop()
+                    self.simulate(dt)
+                    # nothing is drawn, so there is nothing to clear either
+                    ALL_DRAWABLE_OBJECTS.lostsprites.clear()
+                self.stats()
+                timer.click()
+        logger.info(
+            f"Simulated {timer.clicks} frames of {dt:.1f}ms in {pprint(timer.val)}"
+            f" ({timer.clicks / timer.val:.1f} FPS).",
+        )
+
+    def loop_step(self):
+        self.event_loop()
+        self.render()
+        dt = self.FramePerSec.tick(CONFIG.FPS)
+        if not CONFIG.PHYSICS_HZ:
+            self.simulate(dt)
+            self.alpha = 1.0
+            self.accumulator = 0.0
+            return
+
+        step = 1000 / CONFIG.PHYSICS_HZ
+        self.accumulator += dt
+        substeps = 0
+        while self.accumulator >= step:
+            if substeps == CONFIG.MAX_SUBSTEPS:
+                # too far behind, drop the backlog instead of spiralling
+                self.accumulator %= step
+                break
+            self.simulate(step)
+            self.accumulator -= step
+            substeps += 1
+        self.alpha = self.accumulator / step
+
+    def simulate(self, dt: float):
+        with TIMERS["updates"]:
+            self.updates(dt)
+
+        with TIMERS["collisions"]:
+            self.collisions()
+
+    def render(self):
+        with TIMERS["clears"]:
+            ALL_DRAWABLE_OBJECTS.clear(DISPLAYSURF, BackgroundImage)
+            PARTICLES.clear(DISPLAYSURF, BackgroundImage)
+
+        lag = 0.0
+        if CONFIG.PHYSICS_HZ:
+            lag = (1 - self.alpha) * 1000 / CONFIG.PHYSICS_HZ
+        with TIMERS["blits"]:
+            for change in ALL_CHANGES_DISPLAYSURF:
+                DISPLAYSURF.blit(BackgroundImage, change, change)
+
+        dirty = ALL_CHANGES_DISPLAYSURF.copy()
+        ALL_CHANGES_DISPLAYSURF.clear()
+
+        with TIMERS["draw"]:
+            dirty.extend(PARTICLES.draw(DISPLAYSURF, lag))
+            dirty.extend(ALL_DRAWABLE_OBJECTS.draw(DISPLAYSURF, alpha=self.alpha))
+
+        with TIMERS["UX"]:
+            if CONFIG.SHOW_HP == "all":
+                sprite: Object
+                for sprite in ALL_UI_DRAWABLE_OBJECTS:
+                    sprite.draw_ui()
+            elif CONFIG.SHOW_HP == "players":
+                for player in ALL_PLAYERS:
+                    player.draw_ui()
+
+        with TIMERS["DEBUGS"]:
+            for sprite in ALL_WITH_UPDATE:
+                if hasattr(sprite, "draw_debug"):
+                    sprite.draw_debug()
+
+        fps = self.FramePerSec.get_fps()
+
+        display_text(f"{fps:.2f}.", (10, 10))
+
+        if MENU_STACK:
+            MENU_STACK[-1].draw(
+                (CONFIG.WORLD_WIDTH / 4, CONFIG.WORLD_HEIGHT / 10),
+            )
+
+        dirty.extend(ALL_CHANGES_DISPLAYSURF)
+        PRESENTER.present(dirty)
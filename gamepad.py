@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+from functools import cache
+
 from pygame._sdl2 import controller
 
 from logger import logger
+from timers import startup_timer
+
 
-controller.init()
-logger.info(f"Num of controllers: {controller.get_count()}")
+@cache
+def init_gamepads():
+    with startup_timer("gamepads"):
+        controller.init()
+    logger.info(f"Num of controllers: {controller.get_count()}")
 
 
 class MockController:
@@ -17,6 +24,7 @@ class MockController:
 
 
 def get_gamepad(player_id: int):
+    init_gamepads()
     try:
         return controller.Controller(player_id - 1)
     except:  # noqa E722
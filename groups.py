@@ -1,22 +1,34 @@
 from __future__ import annotations
 
+import math
+from functools import cache
 from typing import TYPE_CHECKING, Callable
 
 import pygame as pg
-from pygame import Vector3
+from pygame import Vector2, Vector3
 
-from consts import ALL_SHIFTS
-from spatial import Spatial
+from categories import can_collide
+from collision_logic import get_hull_contact
+from config import CONFIG
+from math_utils import torus_offsets, torus_shift
+from spatial import BROADPHASES
 
 if TYPE_CHECKING:
     from objects import Collides, DrawableObject
 from logger import logger
 
 
+@cache
+def box_mask(width: int, height: int) -> pg.Mask:
+    return pg.Mask((width, height), fill=True)
+
+
 class GroupWithCD(pg.sprite.Group):
+    world: pg.Mask | None = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.spatial = Spatial(builder=set, subx=100, suby=100)
+        self.spatial = BROADPHASES[CONFIG.BROADPHASE]()
 
     def add_internal(self, sprite, layer=None):
         super().add_internal(sprite, layer)
@@ -29,28 +41,77 @@ class GroupWithCD(pg.sprite.Group):
     def move(self, sprite: DrawableObject, rect_a: pg.Rect, rect_b: pg.Rect):
         self.spatial.move(sprite, rect_a, rect_b)
 
-    def _collide_with_callback(
+    def use_broadphase(self, name: str):
+        self.spatial = BROADPHASES[name](*self.sprites())
+
+    @staticmethod
+    def _circles_overlap(
+        sprite: DrawableObject,
+        other: DrawableObject,
+        shift: tuple[int, int],
+    ) -> bool:
+        # rotated rects are loose for elongated sprites
+        (ax, ay), (bx, by) = sprite.metadata.centroid, other.metadata.centroid
+        dx = sprite.rect.x + shift[0] + ax - other.rect.x - bx
+        dy = sprite.rect.y + shift[1] + ay - other.rect.y - by
+        return (
+            dx * dx + dy * dy <= (sprite.metadata.radius + other.metadata.radius) ** 2
+        )
+
+    @classmethod
+    def _collide_shifted(
+        cls,
+        sprite: DrawableObject,
+        other: DrawableObject,
+        shift: tuple[int, int],
+    ) -> bool:
+        if not cls._circles_overlap(sprite, other, shift):
+            return False
+        return (
+            sprite.mask.overlap(
+                other.mask,
+                (
+                    other.rect.x - sprite.rect.x - shift[0],
+                    other.rect.y - sprite.rect.y - shift[1],
+                ),
+            )
+            is not None
+        )
+
+    @staticmethod
+    def _call_shifted(
+        sprite: DrawableObject,
+        other: DrawableObject,
+        shift: tuple[int, int],
+        on_collision,
+    ):
+        # callbacks see sprite moved next to other
+        sprite.pos += Vector3(shift[0], shift[1], 0)
+        sprite.rect.move_ip(shift)
+        on_collision(sprite, other)
+        sprite.pos -= Vector3(shift[0], shift[1], 0)
+        sprite.rect.move_ip(-shift[0], -shift[1])
+
+    def _collide_hulls(
         self,
         sprite: DrawableObject,
-        *,
-        on_collision=None,
-    ) -> list[DrawableObject]:
-        ret = []
-        seen = {sprite}
-        for bucket in self.spatial.all_buckets(sprite.rect):
-            for other in bucket:
-                if other in seen:
-                    continue
-                seen.add(other)
-                if pg.sprite.collide_rect(sprite, other) and pg.sprite.collide_mask(
-                    sprite,
-                    other,
-                ):
-                    ret.append(other)
-                    if on_collision is None:
-                        return ret
-                    on_collision(sprite, other)
-        return ret
+        other: DrawableObject,
+        shift: tuple[int, int],
+        on_collision,
+    ):
+        if not self._circles_overlap(sprite, other, shift):
+            return
+        sprite.pos += Vector3(shift[0], shift[1], 0)
+        contact = get_hull_contact(sprite, other)
+        sprite.pos -= Vector3(shift[0], shift[1], 0)
+        if contact is None:
+            return
+        self._call_shifted(
+            sprite,
+            other,
+            shift,
+            lambda a, b: on_collision(a, b, contact.point, contact.normal),
+        )
 
     def collide_with_callback(
         self,
@@ -59,16 +120,133 @@ class GroupWithCD(pg.sprite.Group):
         on_collision=None,
     ) -> list[DrawableObject]:
         ret = []
-        for shift in ALL_SHIFTS:
-            sprite.pos += Vector3(shift.x, shift.y, 0)
-            sprite.rect.move_ip(shift)
-            ret.extend(self._collide_with_callback(sprite, on_collision=on_collision))
-            sprite.pos -= Vector3(shift.x, shift.y, 0)
-            sprite.rect.move_ip(-shift)
-            if ret and on_collision is None:
+        for other, shift in self.spatial.query(sprite.rect):
+            if other is sprite or not self._collide_shifted(sprite, other, shift):
+                continue
+            ret.append(other)
+            if on_collision is None:
                 return ret
+            self._call_shifted(sprite, other, shift, on_collision)
         return ret
 
+    def ray_hit(
+        self,
+        sprite: DrawableObject,
+        delta: Vector2,
+    ) -> tuple[DrawableObject, tuple[int, int], Vector2] | None:
+        # first hit along the path of the sprite's centroid over the last step
+        pos = sprite.pos_xy
+        hit = self.spatial.ray_cast(
+            pos - delta,
+            delta,
+            delta.length(),
+            predicate=lambda other: other is not sprite and can_collide(sprite, other),
+        )
+        if hit is None:
+            return None
+        other, distance = hit
+        point = pos - delta + delta.normalize() * distance
+        shift = torus_shift(pg.Rect(point.x, point.y, 1, 1), other.rect)
+        return other, shift, point + Vector2(shift)
+
+    def point_hit(
+        self,
+        sprite: DrawableObject,
+    ) -> tuple[DrawableObject, tuple[int, int], Vector2] | None:
+        # the sprite is a point swept from its previous position
+        pos = sprite.pos_xy
+        delta = sprite.step_delta()
+        if delta.length_squared() >= 1:
+            return self.ray_hit(sprite, delta)
+
+        x, y = int(pos.x), int(pos.y)
+        for other, shift in self.spatial.query(pg.Rect(x, y, 1, 1)):
+            if not can_collide(sprite, other):
+                continue
+            local = (x + shift[0] - other.rect.x, y + shift[1] - other.rect.y)
+            if other.mask.get_at(local):
+                return other, shift, pos + Vector2(shift)
+        return None
+
+    def stamp_world(self) -> pg.Mask:
+        # every member's mask in one world-sized bitmap, wrapped on the torus
+        if self.world is None:
+            self.world = pg.Mask((CONFIG.WORLD_WIDTH, CONFIG.WORLD_HEIGHT))
+        world = self.world
+        world.clear()
+        for sprite in self:
+            rect = sprite.rect
+            for dx, dy in torus_offsets(rect):
+                world.draw(sprite.mask, (rect.x + dx, rect.y + dy))
+        return world
+
+    @staticmethod
+    def _world_hit(world: pg.Mask, sprite: DrawableObject) -> bool:
+        # one lookup of the box around the swept pixels, a superset of what
+        # point_hit visits; boxes wrapping around the edge go to point_hit
+        width, height = world.get_size()
+        x, y = sprite.pos.x, sprite.pos.y
+        dx, dy = sprite.step_delta()
+        left = math.floor(min(x, x - dx)) - 1
+        top = math.floor(min(y, y - dy)) - 1
+        right = math.floor(max(x, x - dx)) + 1
+        bottom = math.floor(max(y, y - dy)) + 1
+        if left < 0 or top < 0 or right >= width or bottom >= height:
+            return True
+        box = box_mask(right - left + 1, bottom - top + 1)
+        return world.overlap(box, (left, top)) is not None
+
+    def use_world(self, points: int) -> bool:
+        if CONFIG.OCCUPANCY == "auto":
+            return points >= CONFIG.OCCUPANCY_MIN_POINTS
+        return CONFIG.OCCUPANCY == "on"
+
+    def collide_points(self, sprites: pg.sprite.Group, *, on_collision):
+        world = self.stamp_world() if self.use_world(len(sprites)) else None
+        for sprite in sprites:
+            if world is not None and not self._world_hit(world, sprite):
+                continue
+            hit = self.point_hit(sprite)
+            if hit is None:
+                continue
+            other, shift, point = hit
+            self._call_shifted(
+                sprite,
+                other,
+                shift,
+                lambda a, b: on_collision(a, b, point),  # noqa: B023
+            )
+
+    def collide_swept(self, sprites: pg.sprite.Group, *, on_collision):
+        # fast sprites that moved more than their radius could have tunnelled
+        # through something since the last step
+        for sprite in sprites:
+            if not sprite.alive_state:
+                continue
+            delta = sprite.step_delta()
+            if delta.length() <= sprite.metadata.radius:
+                continue
+            hit = self.ray_hit(sprite, delta)
+            if hit is None:
+                continue
+            other, shift, point = hit
+            self._call_shifted(
+                sprite,
+                other,
+                shift,
+                lambda a, b: on_collision(a, b, point),  # noqa: B023
+            )
+
+    def collide_pairs(self, *, on_collision):
+        if self.spatial.NAME != CONFIG.BROADPHASE:
+            self.use_broadphase(CONFIG.BROADPHASE)
+        hulls = CONFIG.NARROWPHASE == "hull"
+        for sprite, other, shift in self.spatial.pairs(can_collide):
+            if hulls and sprite.HULL and other.HULL:
+                self._collide_hulls(sprite, other, shift, on_collision)
+            elif self._collide_shifted(sprite, other, shift):
+                self._call_shifted(sprite, other, shift, on_collision)
+
 
 class GroupWithPriority(pg.sprite.Group):
     def __init__(self, *args, key: str, **kwargs):
@@ -84,12 +262,56 @@ class LayeredUpdates(GroupWithPriority, pg.sprite.RenderUpdates):
         super().__init__(*args, **kwargs, key="_layer")
 
 
+class TorusUpdates(LayeredUpdates):
+    def remove_internal(self, sprite):
+        self.lostsprites.extend(self.spritedict[sprite] or ())
+        del self.spritedict[sprite]
+
+    def draw(
+        self,
+        surface: pg.Surface,
+        bgd=None,
+        special_flags=0,
+        *,
+        alpha: float = 1.0,
+    ) -> list[pg.Rect]:
+        surface_blit = surface.blit
+        dirty = self.lostsprites
+        self.lostsprites = []
+        for sprite in self.sprites():
+            rect = sprite.rect
+            if alpha < 1.0:
+                rect = rect.move(sprite.render_offset(alpha))
+            if old_rects := self.spritedict[sprite]:
+                dirty.extend(old_rects)
+            new_rects = [
+                surface_blit(
+                    sprite.image,
+                    (rect.x + dx, rect.y + dy),
+                    None,
+                    special_flags,
+                )
+                for dx, dy in torus_offsets(rect)
+            ]
+            dirty.extend(new_rects)
+            self.spritedict[sprite] = new_rects
+        return dirty
+
+    def clear(self, surface: pg.Surface, bgd: pg.Surface):
+        surface_blit = surface.blit
+        for lost_clear_rect in self.lostsprites:
+            surface_blit(bgd, lost_clear_rect, lost_clear_rect)
+        for clear_rects in self.spritedict.values():
+            for clear_rect in clear_rects or ():
+                surface_blit(bgd, clear_rect, clear_rect)
+
+
 ALL_ENEMIES: pg.sprite.Group = pg.sprite.Group()
-ALL_PLAYERS: pg.sprite.Group = pg.sprite.Group()
+ALL_PLAYERS: GroupWithCD = GroupWithCD()
 ALL_COLLIDING_OBJECTS: GroupWithCD = GroupWithCD()
-ALL_DRAWABLE_OBJECTS: dict[tuple(int, int), LayeredUpdates] = {
-    (shift.x, shift.y): LayeredUpdates() for shift in ALL_SHIFTS
-}
+ALL_POINT_COLLIDERS: pg.sprite.Group = pg.sprite.Group()
+ALL_FAST_COLLIDERS: pg.sprite.Group = pg.sprite.Group()
+ALL_DRAWABLE_OBJECTS: TorusUpdates = TorusUpdates()
 ALL_POWERUPS: GroupWithCD = GroupWithCD()
 ALL_UI_DRAWABLE_OBJECTS: pg.sprite.Group = pg.sprite.Group()
 ALL_WITH_UPDATE: GroupWithPriority = GroupWithPriority(key="priority")
@@ -100,7 +322,9 @@ def kill_all():
         ALL_ENEMIES,
         ALL_PLAYERS,
         ALL_COLLIDING_OBJECTS,
-        *ALL_DRAWABLE_OBJECTS.values(),
+        ALL_POINT_COLLIDERS,
+        ALL_FAST_COLLIDERS,
+        ALL_DRAWABLE_OBJECTS,
         ALL_POWERUPS,
         ALL_UI_DRAWABLE_OBJECTS,
         ALL_WITH_UPDATE,
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import math
+from functools import cache
+from typing import NamedTuple
+
+import pygame as pg
+
+
+class MaskMetadata(NamedTuple):
+    centroid: tuple[float, float]
+    area: int
+    # central second moments per pixel: xx, yy, xy
+    moments: tuple[float, float, float]
+    # distance from the centroid that contains every set pixel
+    radius: float
+
+    @property
+    def inertia_moment_coef(self) -> float:
+        return self.moments[0] + self.moments[1]
+
+    def rotate_quarter(self, size: tuple[int, int]) -> MaskMetadata:
+        # pixel (x, y) of a w x h image lands at (y, w - 1 - x)
+        w, _ = size
+        x, y = self.centroid
+        xx, yy, xy = self.moments
+        return MaskMetadata((y, w - 1 - x), self.area, (yy, xx, -xy), self.radius)
+
+
+@cache
+def _line_mask(size: tuple[int, int]) -> pg.Mask:
+    return pg.Mask(size, fill=True)
+
+
+@cache
+def _diagonal_mask(size: int) -> pg.Mask:
+    mask = pg.Mask((size, size))
+    for x in range(size):
+        mask.set_at((x, size - 1 - x))
+    return mask
+
+
+def _weighted_sums(counts: list[int]) -> tuple[int, int]:
+    s1, s2 = 0, 0
+    for i, cnt in enumerate(counts):
+        s1 += i * cnt
+        s2 += i * i * cnt
+    return s1, s2
+
+
+def _extent(counts: list[int]) -> tuple[int, int]:
+    nonzero = [i for i, cnt in enumerate(counts) if cnt]
+    return nonzero[0], nonzero[-1] + 1
+
+
+def mask_metadata(mask: pg.Mask) -> MaskMetadata:
+    # per column / row / anti-diagonal pixel counts come from overlap_area,
+    # so the work is O(w + h) native calls instead of O(w * h) get_at calls
+    w, h = mask.get_size()
+    cnt = mask.count()
+    if cnt == 0:
+        return MaskMetadata(((w - 1) / 2, (h - 1) / 2), 0, (0.0, 0.0, 0.0), 0.0)
+
+    column = _line_mask((1, h))
+    row = _line_mask((w, 1))
+    columns = [mask.overlap_area(column, (x, 0)) for x in range(w)]
+    rows = [mask.overlap_area(row, (0, y)) for y in range(h)]
+    sx, sxx = _weighted_sums(columns)
+    sy, syy = _weighted_sums(rows)
+
+    # anti-diagonal x + y = k, gives the sum of (x + y)**2 and so of x * y
+    n = w + h - 1
+    diagonal = _diagonal_mask(n)
+    _, sdd = _weighted_sums(
+        [mask.overlap_area(diagonal, (k - n + 1, 0)) for k in range(n)],
+    )
+    sxy = (sdd - sxx - syy) / 2
+
+    cx, cy = sx / cnt, sy / cnt
+    moments = (sxx / cnt - cx**2, syy / cnt - cy**2, sxy / cnt - cx * cy)
+
+    # farthest corner of the bounding box; pixel (x, y) covers
+    # [x, x + 1) x [y, y + 1), so the centroid sits at (cx + 0.5, cy + 0.5)
+    left, right = _extent(columns)
+    top, bottom = _extent(rows)
+    radius = math.hypot(
+        max(cx + 0.5 - left, right - cx - 0.5),
+        max(cy + 0.5 - top, bottom - cy - 0.5),
+    )
+    return MaskMetadata((cx, cy), cnt, moments, radius)
+
+
+def convex_hull(points: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    # monotone chain, collinear points dropped
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+
+    def cross(o, a, b) -> float:
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower: list[tuple[float, float]] = []
+    upper: list[tuple[float, float]] = []
+    for chain, ordered in ((lower, points), (upper, reversed(points))):
+        for p in ordered:
+            while len(chain) >= 2 and cross(chain[-2], chain[-1], p) <= 0:
+                chain.pop()
+            chain.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def mask_hull(
+    mask: pg.Mask,
+    centroid: tuple[float, float],
+) -> list[tuple[float, float]]:
+    # hull of the outline pixels' corners, relative to the centroid
+    cx, cy = centroid
+    return convex_hull(
+        [
+            (x + dx - cx, y + dy - cy)
+            for x, y in mask.outline()
+            for dx in (-0.5, 0.5)
+            for dy in (-0.5, 0.5)
+        ],
+    )
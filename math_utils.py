@@ -1,32 +1,12 @@
 from __future__ import annotations
 
+import math
+
 from pygame.math import Vector2, Vector3
 
 from config import CONFIG
 
 
-def range_kutta_4(f, x, y, dt):
-    h1, k1 = f(x, y)
-    h2, k2 = f(x + dt / 2 * h1, y + dt / 2 * k1)
-    h3, k3 = f(x + dt / 2 * h2, y + dt / 2 * k2)
-    h4, k4 = f(x + dt * h3, y + dt * k3)
-    return (
-        x + (h1 + 2 * h2 + 2 * h3 + h4) * dt / 6,
-        y + (k1 + 2 * k2 + 2 * k3 + k4) * dt / 6,
-    )
-
-
-def range_kutta_1(f, x, y, dt):
-    h1, k1 = f(x, y)
-    return x + dt * h1, y + dt * k1
-
-
-def range_kutta_2(f, x, y, dt):
-    h1, k1 = f(x, y)
-    h2, k2 = f(x + dt * h1, y + dt * k1)
-    return x + (h1 + h2) * dt / 2, y + (k1 + k2) * dt / 2
-
-
 def normalize_pos2(pos: Vector2):
     return Vector2(pos.x % CONFIG.WORLD_WIDTH, pos.y % CONFIG.WORLD_HEIGHT)
 
@@ -39,5 +19,154 @@ def normalize_pos3(pos: Vector3):
     )
 
 
+def torus_offsets(rect) -> list[tuple[int, int]]:
+    xs = [
+        dx
+        for dx in (0, -CONFIG.WORLD_WIDTH, CONFIG.WORLD_WIDTH)
+        if rect.right + dx > 0 and rect.left + dx < CONFIG.WORLD_WIDTH
+    ]
+    ys = [
+        dy
+        for dy in (0, -CONFIG.WORLD_HEIGHT, CONFIG.WORLD_HEIGHT)
+        if rect.bottom + dy > 0 and rect.top + dy < CONFIG.WORLD_HEIGHT
+    ]
+    return [(dx, dy) for dx in xs for dy in ys]
+
+
+def torus_shift(rect_a, rect_b) -> tuple[int, int]:
+    # moves rect_a to its periodic copy nearest to rect_b
+    return (
+        round((rect_b.centerx - rect_a.centerx) / CONFIG.WORLD_WIDTH)
+        * CONFIG.WORLD_WIDTH,
+        round((rect_b.centery - rect_a.centery) / CONFIG.WORLD_HEIGHT)
+        * CONFIG.WORLD_HEIGHT,
+    )
+
+
+def torus_delta(a: Vector2, b: Vector2) -> Vector2:
+    # b - a through the periodic copy of b nearest to a
+    width, height = CONFIG.WORLD_WIDTH, CONFIG.WORLD_HEIGHT
+    return Vector2(
+        (b.x - a.x + width / 2) % width - width / 2,
+        (b.y - a.y + height / 2) % height - height / 2,
+    )
+
+
+def rotate_polygon(
+    points: list[tuple[float, float]],
+    ang: float,
+) -> tuple[list[tuple[float, float]], list[tuple[float, float]]]:
+    """Points turned like pg.transform.rotate would, and their unit edge normals."""
+    c, s = math.cos(math.radians(ang)), math.sin(math.radians(ang))
+    points = [(x * c + y * s, y * c - x * s) for x, y in points]
+    axes = []
+    for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length:
+            axes.append(((y0 - y1) / length, (x1 - x0) / length))
+    return points, axes
+
+
+def separating_axis(
+    points_a: list[tuple[float, float]],
+    axes_a: list[tuple[float, float]],
+    points_b: list[tuple[float, float]],
+    axes_b: list[tuple[float, float]],
+) -> tuple[float, tuple[float, float]] | None:
+    """Smallest overlap of two convex polygons and its axis, None if separated."""
+    best_depth, best_axis = math.inf, (0.0, 0.0)
+    for axis in axes_a + axes_b:
+        nx, ny = axis
+        proj_a = [x * nx + y * ny for x, y in points_a]
+        proj_b = [x * nx + y * ny for x, y in points_b]
+        depth = min(max(proj_a) - min(proj_b), max(proj_b) - min(proj_a))
+        if depth <= 0:
+            return None
+        if depth < best_depth:
+            best_depth, best_axis = depth, axis
+    return best_depth, best_axis
+
+
 def internal_coord_to_xy(pos: Vector2, ang: float) -> Vector2:
     return Vector2(pos.x, -pos.y).rotate(-ang)
+
+
+def _drag_accels(
+    z: float,
+    vx: float,
+    vy: float,
+    vz: float,
+    accel: Vector3,
+    drag: float,
+    angular_drag: float,
+) -> tuple[float, float, float]:
+    # internal_coord_to_xy(accel.xy, z) minus quadratic drag, on plain floats
+    rad = math.radians(z)
+    sin, cos = math.sin(rad), math.cos(rad)
+    linear_drag = math.hypot(vx, vy) * drag
+    return (
+        accel.x * cos - accel.y * sin - linear_drag * vx,
+        -accel.x * sin - accel.y * cos - linear_drag * vy,
+        accel.z - vz * abs(vz) * angular_drag,
+    )
+
+
+def integrate_with_drag(
+    pos: Vector3,
+    speed: Vector3,
+    accel: Vector3,
+    drag: float,
+    angular_drag: float,
+    dt: float,
+    order: int = 2,
+) -> tuple[Vector3, Vector3]:
+    x, y, z = pos
+    vx, vy, vz = speed
+    ax1, ay1, az1 = _drag_accels(z, vx, vy, vz, accel, drag, angular_drag)
+    if order == 1:
+        return (
+            Vector3(x + dt * vx, y + dt * vy, z + dt * vz),
+            Vector3(vx + dt * ax1, vy + dt * ay1, vz + dt * az1),
+        )
+    if order == 2:
+        vx2, vy2, vz2 = vx + dt * ax1, vy + dt * ay1, vz + dt * az1
+        ax2, ay2, az2 = _drag_accels(
+            z + dt * vz,
+            vx2,
+            vy2,
+            vz2,
+            accel,
+            drag,
+            angular_drag,
+        )
+        return (
+            Vector3(
+                x + (vx + vx2) * dt / 2,
+                y + (vy + vy2) * dt / 2,
+                z + (vz + vz2) * dt / 2,
+            ),
+            Vector3(
+                vx + (ax1 + ax2) * dt / 2,
+                vy + (ay1 + ay2) * dt / 2,
+                vz + (az1 + az2) * dt / 2,
+            ),
+        )
+    h = dt / 2
+    vx2, vy2, vz2 = vx + h * ax1, vy + h * ay1, vz + h * az1
+    ax2, ay2, az2 = _drag_accels(z + h * vz, vx2, vy2, vz2, accel, drag, angular_drag)
+    vx3, vy3, vz3 = vx + h * ax2, vy + h * ay2, vz + h * az2
+    ax3, ay3, az3 = _drag_accels(z + h * vz2, vx3, vy3, vz3, accel, drag, angular_drag)
+    vx4, vy4, vz4 = vx + dt * ax3, vy + dt * ay3, vz + dt * az3
+    ax4, ay4, az4 = _drag_accels(z + dt * vz3, vx4, vy4, vz4, accel, drag, angular_drag)
+    return (
+        Vector3(
+            x + (vx + 2 * vx2 + 2 * vx3 + vx4) * dt / 6,
+            y + (vy + 2 * vy2 + 2 * vy3 + vy4) * dt / 6,
+            z + (vz + 2 * vz2 + 2 * vz3 + vz4) * dt / 6,
+        ),
+        Vector3(
+            vx + (ax1 + 2 * ax2 + 2 * ax3 + ax4) * dt / 6,
+            vy + (ay1 + 2 * ay2 + 2 * ay3 + ay4) * dt / 6,
+            vz + (az1 + 2 * az2 + 2 * az3 + az4) * dt / 6,
+        ),
+    )
@@ -7,6 +7,7 @@ from config import CONFIG
 from display import ALL_CHANGES_DISPLAYSURF, DISPLAYSURF, set_mode
 from game_logic import init_game_state
 from groups import kill_all
+from particles import PARTICLES
 from text import display_text
 
 
@@ -55,6 +56,7 @@ class RestartElement(TextMenuElement):
     def take_action(self):
         MENU_STACK.clear()
         kill_all()
+        PARTICLES.kill_all()
         init_game_state()
         pg.display.quit()
         set_mode()
@@ -70,6 +72,12 @@ class OptionsElement(TextMenuElement):
                 ConfigMenuElement(option="SHOW_HP"),
                 ConfigMenuElement(option="NUM_OF_PLAYERS"),
                 ConfigMenuElement(option="RESOLUTION"),
+                ConfigMenuElement(option="PRESENTATION"),
+                ConfigMenuElement(option="PHYSICS_HZ"),
+                ConfigMenuElement(option="RK_ORDER"),
+                ConfigMenuElement(option="BROADPHASE"),
+                ConfigMenuElement(option="NARROWPHASE"),
+                ConfigMenuElement(option="OCCUPANCY"),
             ),
         )
 
@@ -18,19 +18,23 @@ from consts import (
 from groups import (
     ALL_COLLIDING_OBJECTS,
     ALL_DRAWABLE_OBJECTS,
+    ALL_FAST_COLLIDERS,
+    ALL_POINT_COLLIDERS,
     ALL_UI_DRAWABLE_OBJECTS,
     ALL_WITH_UPDATE,
     GroupWithCD,
 )
 from math_utils import (
+    integrate_with_drag,
     internal_coord_to_xy,
     normalize_pos3,
-    range_kutta_2,
+    torus_delta,
 )
-from postprocessing import with_outline
-from teams import get_team_color
+from pools import ObjectPool
+from teams import get_player_id, get_team_color
 
 if TYPE_CHECKING:
+    from masks import MaskMetadata
     from surface import CachedAnimation, CachedSurface
 
 import contextlib
@@ -55,9 +59,12 @@ class Object(pg.sprite.Sprite):
         if owner is None:
             owner = self
         self.owner = owner
+        self.owner_player_id = get_player_id(owner)
         self.update_image_rect()
-        self.all_statuses = pg.sprite.Group()
-        self.attachments = pg.sprite.Group()
+        if not hasattr(self, "attachments"):
+            # recycled instances keep their emptied groups
+            self.all_statuses = pg.sprite.Group()
+            self.attachments = pg.sprite.Group()
         self.add(ALL_WITH_UPDATE, *args)
 
     def kill(self):
@@ -82,6 +89,26 @@ class Object(pg.sprite.Sprite):
         return Vector2(self.pos.x, self.pos.y)
 
 
+class Pooled:
+    # killed instances wait in their class' pool for a later construction,
+    # which runs __init__ on them again as the reset
+    POOL: ObjectPool
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.POOL = ObjectPool(cls.__qualname__)
+
+    def __new__(cls, *args, **kwargs):
+        obj = cls.POOL.take()
+        return super().__new__(cls) if obj is None else obj
+
+    def kill(self):
+        alive = self.alive()
+        super().kill()
+        if alive:
+            self.POOL.release(self)
+
+
 class Attached:
     def __init__(self, *args, init_rel_pos: Vector3, base_object: Object, **kwargs):
         self.base_object = base_object
@@ -137,18 +164,16 @@ class MovesAbstract:
 
 class Moves(MovesAbstract):
     def updated_pos(self, dt: float) -> tuple[Vector3, Vector3]:
-        all_accel = self.get_accels()
-
-        def f(pos: Vector3, speed: Vector3):
-            acc = internal_coord_to_xy(Vector2(all_accel.x, all_accel.y), pos.z)
-            angular_drag = speed.z * abs(speed.z) * self.ANGULAR_DRAG
-            speed_xy = Vector2(speed.x, speed.y)
-            # |drag| = self.DRAG * |speed|**2
-            drag = speed_xy.length() * self.DRAG * speed_xy
-            acc -= drag
-            return speed, Vector3(acc.x, acc.y, all_accel.z - angular_drag)
-
-        return range_kutta_2(f, self.pos, self.speed, dt)
+        # |drag| = self.DRAG * |speed|**2
+        return integrate_with_drag(
+            self.pos,
+            self.speed,
+            self.get_accels(),
+            self.DRAG,
+            self.ANGULAR_DRAG,
+            dt,
+            CONFIG.RK_ORDER,
+        )
 
 
 class MovesSimplified(MovesAbstract):
@@ -160,6 +185,7 @@ class DrawableObject:
     image: pg.Surface
     rect: pg.Rect
     mask: pg.Mask
+    metadata: MaskMetadata
 
     def __init__(self, *args, image=None, **kwargs):
         if image is None:
@@ -170,41 +196,45 @@ class DrawableObject:
         else:
             self._image = image
         super().__init__(*args, **kwargs)
-
-        rect = self.rect
-        x_start_a = rect.left // CONFIG.WORLD_WIDTH
-        x_end_a = rect.right // CONFIG.WORLD_WIDTH
-        y_start_a = rect.top // CONFIG.WORLD_HEIGHT
-        y_end_a = rect.bottom // CONFIG.WORLD_HEIGHT
-        for x in range(x_start_a, x_end_a + 1):
-            for y in range(y_start_a, y_end_a + 1):
-                self.add(
-                    ALL_DRAWABLE_OBJECTS[
-                        (-x * CONFIG.WORLD_WIDTH, -y * CONFIG.WORLD_HEIGHT)
-                    ],
-                )
+        self.prev_pos = self.pos
+        self.add(ALL_DRAWABLE_OBJECTS)
 
     def get_surface(self) -> CachedSurface:
         raise NotImplementedError
 
     def update_image_rect(self):
         surf = self.get_surface()
+        self.metadata = surf.get_mask_metadata(self.pos.z)
 
         self.rect = surf.get_rect(
             self.pos.z,
-            topleft=self.pos_xy - surf.get_centroid(int(self.pos.z)),
+            topleft=self.pos_xy - Vector2(self.metadata.centroid),
         )
         self.mask = surf.get_mask(self.pos.z)
-        self.image = surf.get_image(self.pos.z)
         self.postprocessing()
 
     def postprocessing(self):
-        self.image = with_outline(self, get_team_color(self))
+        # sets self.image
+        self.image = self.get_surface().get_outlined_image(
+            self.pos.z,
+            get_team_color(self),
+        )
+
+    def step_delta(self) -> Vector2:
+        return torus_delta(Vector2(self.prev_pos.x, self.prev_pos.y), self.pos_xy)
+
+    def render_offset(self, alpha: float) -> tuple[int, int]:
+        # draw between the previous and the current physics step
+        width, height = CONFIG.WORLD_WIDTH, CONFIG.WORLD_HEIGHT
+        dx = (self.pos.x - self.prev_pos.x + width / 2) % width - width / 2
+        dy = (self.pos.y - self.prev_pos.y + height / 2) % height - height / 2
+        return round((alpha - 1) * dx), round((alpha - 1) * dy)
 
     def update(self, dt: float):
         super().update(dt)
         old_rect = self.rect
         old_pos = self.pos
+        self.prev_pos = old_pos
         self.update_pos(dt)
         new_pos = self.pos
         if (
@@ -223,40 +253,6 @@ class DrawableObject:
             if isinstance(group, GroupWithCD):
                 group.move(self, new_rect, old_rect)
 
-        x_start_a = new_rect.left // CONFIG.WORLD_WIDTH
-        x_end_a = new_rect.right // CONFIG.WORLD_WIDTH
-        y_start_a = new_rect.top // CONFIG.WORLD_HEIGHT
-        y_end_a = new_rect.bottom // CONFIG.WORLD_HEIGHT
-        x_start_b = old_rect.left // CONFIG.WORLD_WIDTH
-        x_end_b = old_rect.right // CONFIG.WORLD_WIDTH
-        y_start_b = old_rect.top // CONFIG.WORLD_HEIGHT
-        y_end_b = old_rect.bottom // CONFIG.WORLD_HEIGHT
-        if (
-            x_start_a == x_start_b
-            and x_end_a == x_end_b
-            and y_start_a == y_start_b
-            and y_end_a == y_end_b
-        ):
-            return
-        for x in range(x_start_b, x_end_b + 1):
-            for y in range(y_start_b, y_end_b + 1):
-                if x_start_a <= x <= x_end_a and y_start_a <= y <= y_end_a:
-                    continue
-                self.remove(
-                    ALL_DRAWABLE_OBJECTS[
-                        (-x * CONFIG.WORLD_WIDTH, -y * CONFIG.WORLD_HEIGHT)
-                    ],
-                )
-        for x in range(x_start_a, x_end_a + 1):
-            for y in range(y_start_a, y_end_a + 1):
-                if x_start_b <= x <= x_end_b and y_start_b <= y <= y_end_b:
-                    continue
-                self.add(
-                    ALL_DRAWABLE_OBJECTS[
-                        (-x * CONFIG.WORLD_WIDTH, -y * CONFIG.WORLD_HEIGHT)
-                    ],
-                )
-
 
 class StaticDrawable(DrawableObject):
     _image: CachedSurface
@@ -320,9 +316,19 @@ class HasMass:
 
 
 class Collides:
+    CATEGORY: int
+    FAST = False  # swept over each step, point colliders always are
+    HULL = False  # large rigid bodies, may collide by their convex hulls
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.add(ALL_COLLIDING_OBJECTS)
+        if max(self.get_surface().get_rect().size) <= CONFIG.POINT_COLLIDER_SIZE:
+            # tested as points against the others, never against each other
+            self.add(ALL_POINT_COLLIDERS)
+        else:
+            self.add(ALL_COLLIDING_OBJECTS)
+            if self.FAST:
+                self.add(ALL_FAST_COLLIDERS)
 
     def on_collision(self, other: Object):
         pass
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
 import pygame as pg
+from pygame import Vector2
 
+from categories import PARTICLE
+from config import CONFIG
 from consts import BLACK, RED, WHITE, YELLOW
-from objects import Collides, DrawableObject, HasMass, HasTimer, MovesSimplified, Object
+from objects import (
+    Collides,
+    DrawableObject,
+    HasMass,
+    HasTimer,
+    MovesSimplified,
+    Object,
+    Pooled,
+)
 from surface import CachedSurface
-from teams import check_teams
 
 particles_cache: dict[tuple[int, ...], CachedSurface] = {}
 color_mixer_cache: dict = {}
+particle_images: dict[int, pg.Surface] = {}
 
 
 def mix(c1: pg.Color, c2: pg.Color, c3: pg.Color, c4: pg.Color, t: float) -> pg.Color:
@@ -17,7 +28,7 @@ def mix(c1: pg.Color, c2: pg.Color, c3: pg.Color, c4: pg.Color, t: float) -> pg.
     return pg.Color.lerp(c12, c34, t**2 * (3 - 2 * t))
 
 
-class Particle(HasTimer, MovesSimplified, DrawableObject, Object):
+class Particle(Pooled, HasTimer, MovesSimplified, DrawableObject, Object):
     IMAGE = None
 
     def __init__(self, *args, **kwargs):
@@ -25,23 +36,126 @@ class Particle(HasTimer, MovesSimplified, DrawableObject, Object):
         super().__init__(*args, **kwargs)
 
     def get_surface(self) -> CachedSurface:
-        t = int(100 * min(1, self.alive_time / self.ttl))
-        if t not in color_mixer_cache:
-            color_mixer_cache[t] = mix(WHITE, YELLOW, RED, BLACK, t / 100)
-        color = color_mixer_cache[t]
+        return particle_surface(int(100 * min(1, self.alive_time / self.ttl)))
 
-        if tuple(color) not in particles_cache:
-            tmp = pg.surface.Surface((2, 2), flags=pg.SRCALPHA)
-            tmp.fill(color)
-            particles_cache[tuple(color)] = CachedSurface(tmp, no_rotation=True)
-        return particles_cache[tuple(color)]
+
+def particle_surface(t: int) -> CachedSurface:
+    if t not in color_mixer_cache:
+        color_mixer_cache[t] = mix(WHITE, YELLOW, RED, BLACK, t / 100)
+    color = color_mixer_cache[t]
+
+    if tuple(color) not in particles_cache:
+        tmp = pg.surface.Surface((2, 2), flags=pg.SRCALPHA)
+        tmp.fill(color)
+        particles_cache[tuple(color)] = CachedSurface(tmp, no_rotation=True)
+    return particles_cache[tuple(color)]
+
+
+def particle_image(t: int) -> pg.Surface:
+    if t not in particle_images:
+        particle_images[t] = particle_surface(t).get_outlined_image(0, RED)
+    return particle_images[t]
+
+
+PARTICLE_CELL = 32
+
+
+class ParticleSystem:
+    # Non-colliding particles kept as parallel lists instead of sprites,
+    # rebuilt from the survivors on every update.
+    # Drawn pixels are tracked per PARTICLE_CELL cell, which bounds the number
+    # of dirty rects no matter how many particles there are.
+    x: list[float]
+    y: list[float]
+    vx: list[float]
+    vy: list[float]
+    age: list[float]
+    ttl: list[float]
+    cells: set[tuple[int, int]]
+
+    def __init__(self):
+        self.kill_all()
+        self.cells = set()
+
+    def __len__(self):
+        return len(self.x)
+
+    def kill_all(self):
+        self.x, self.y, self.vx, self.vy, self.age, self.ttl = ([] for _ in range(6))
+
+    def emit(self, pos: Vector2, speed: Vector2, ttl: float):
+        self.x.append(pos.x % CONFIG.WORLD_WIDTH)
+        self.y.append(pos.y % CONFIG.WORLD_HEIGHT)
+        self.vx.append(speed.x)
+        self.vy.append(speed.y)
+        self.age.append(0.0)
+        self.ttl.append(ttl)
+
+    def update(self, dt: float):
+        width, height = CONFIG.WORLD_WIDTH, CONFIG.WORLD_HEIGHT
+        alive = [
+            ((x + vx * dt) % width, (y + vy * dt) % height, vx, vy, age + dt, ttl)
+            for x, y, vx, vy, age, ttl in zip(
+                self.x,
+                self.y,
+                self.vx,
+                self.vy,
+                self.age,
+                self.ttl,
+            )
+            if age < ttl
+        ]
+        columns = zip(*alive) if alive else ((),) * 6
+        self.x, self.y, self.vx, self.vy, self.age, self.ttl = (
+            list(column) for column in columns
+        )
+
+    def clear(self, surface: pg.Surface, bgd: pg.Surface):
+        surface_blit = surface.blit
+        for rect in self._cell_rects(self.cells):
+            surface_blit(bgd, rect, rect)
+
+    def draw(self, surface: pg.Surface, lag: float = 0.0) -> list[pg.Rect]:
+        # particles are drawn where they were `lag` ms before the last step
+        size = PARTICLE_CELL
+        blits = []
+        cells = set()
+        for x, y, vx, vy, age, ttl in zip(
+            self.x,
+            self.y,
+            self.vx,
+            self.vy,
+            self.age,
+            self.ttl,
+        ):
+            image = particle_image(int(100 * min(1, age / ttl)))
+            w, h = image.get_size()
+            x0, y0 = int(x - vx * lag) - w // 2, int(y - vy * lag) - h // 2
+            blits.append((image, (x0, y0)))
+            cx0, cy0 = x0 // size, y0 // size
+            cx1, cy1 = (x0 + w - 1) // size, (y0 + h - 1) // size
+            cells.add((cx0, cy0))
+            if cx0 != cx1 or cy0 != cy1:
+                cells.update(((cx1, cy0), (cx0, cy1), (cx1, cy1)))
+        surface.fblits(blits)
+        dirty = self._cell_rects(cells | self.cells)
+        self.cells = cells
+        return dirty
+
+    @staticmethod
+    def _cell_rects(cells: set[tuple[int, int]]) -> list[pg.Rect]:
+        size = PARTICLE_CELL
+        return [pg.Rect(cx * size, cy * size, size, size) for cx, cy in cells]
+
+
+PARTICLES = ParticleSystem()
 
 
 class CollidingParticle(Collides, HasMass, Particle):
+    CATEGORY = PARTICLE
     MASS = 0.1
 
     def on_collision(self, other: Object):
-        if not isinstance(other, CollidingParticle) and check_teams(self, other):
-            if hasattr(other, "apply_damage"):
-                other.apply_damage(0.1)
-            self.mark_dead()
+        if hasattr(other, "apply_damage"):
+            other.apply_damage(0.1)
+        self.mark_dead()
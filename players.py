@@ -7,6 +7,7 @@ import pygame as pg
 from pygame import Vector3
 
 from assets import PlayerImages
+from categories import SHIP
 from config import CONFIG
 from controls import PLAYER_1_CONTROLS, PLAYER_2_CONTROLS
 from delayed import DelayedEvent
@@ -45,6 +46,8 @@ class Player(
     Collides,
     Object,
 ):
+    CATEGORY = SHIP
+    HULL = True
     DRAG = 1 / 1000
     ANGULAR_DRAG = 2 / 1000
 
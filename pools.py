@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from config import CONFIG
+
+if TYPE_CHECKING:
+    from objects import Object
+
+
+class ObjectPool:
+    # instances killed during a frame are only handed out again after
+    # recycle(), on_death() still runs on them after kill()
+    name: str
+    free: list[Object]
+    released: list[Object]
+    live: int
+    peak: int
+    created: int
+    reused: int
+
+    def __init__(self, name: str):
+        self.name = name
+        self.free = []
+        self.released = []
+        self.live = 0
+        self.peak = 0
+        self.created = 0
+        self.reused = 0
+        POOLS.append(self)
+
+    def take(self) -> Object | None:
+        self.live += 1
+        self.peak = max(self.peak, self.live)
+        if self.free:
+            self.reused += 1
+            return self.free.pop()
+        self.created += 1
+        return None
+
+    def release(self, obj: Object):
+        self.live -= 1
+        if len(self.free) + len(self.released) < CONFIG.POOL_SIZE:
+            self.released.append(obj)
+
+    def recycle(self):
+        self.free.extend(self.released)
+        self.released.clear()
+
+    def __repr__(self):
+        return (
+            f"{self.name} live:{self.live} peak:{self.peak} free:{len(self.free)} "
+            f"created:{self.created} reused:{self.reused}"
+        )
+
+    def reset_stats(self):
+        self.peak = self.live
+        self.created = 0
+        self.reused = 0
+
+
+POOLS: list[ObjectPool] = []
+
+
+def recycle_pools():
+    for pool in POOLS:
+        pool.recycle()
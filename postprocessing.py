@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import pygame as pg
 
+OUTLINE_KERNEL = pg.Mask((3, 3), fill=1)
 
-def with_outline(sprite: pg.Sprite, color: pg.Color):
-    new_mask = sprite.mask.copy()
-    sprite.mask.convolve(pg.Mask((3, 3), fill=1), new_mask, (-1, -1))
+
+def outline(image: pg.Surface, mask: pg.Mask, color: pg.Color) -> pg.Surface:
+    new_mask = mask.copy()
+    mask.convolve(OUTLINE_KERNEL, new_mask, (-1, -1))
     s = new_mask.to_surface(setcolor=color, unsetcolor=(0, 0, 0, 0))
-    s.blit(sprite.image)
+    s.blit(image)
     return s
+
+
+def with_outline(sprite: pg.Sprite, color: pg.Color):
+    return outline(sprite.image, sprite.mask, color)
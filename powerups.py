@@ -31,6 +31,7 @@ class PowerUp(StaticDrawable, Stationary, HasTimer, Object):
         self.add(ALL_POWERUPS)
 
     def postprocessing(self):
+        self.image = self.get_surface().get_image(self.pos.z)
         return with_outline(self, YELLOW)
 
     def on_collision(self, other: Object):
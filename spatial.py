@@ -1,68 +1,435 @@
 from __future__ import annotations
 
+import math
+from bisect import bisect_left
 from collections import defaultdict
+from operator import itemgetter
 from typing import TYPE_CHECKING, Callable
 
+import pygame as pg
+
+from config import CONFIG
+from math_utils import torus_delta, torus_offsets, torus_shift
+
 if TYPE_CHECKING:
-    import pygame as pg
+    from collections.abc import Iterable
+
+    from pygame import Vector2
 
     from objects import DrawableObject
 
+# Every broadphase answers the same two questions on the torus:
+# query(rect) -> [(sprite, shift)] such that rect.move(shift) overlaps sprite.rect
+# pairs(predicate) -> [(a, b, shift)], each overlapping pair accepted by the
+# predicate once, a.rect.move(shift) overlapping b.rect
+# The radius, nearest and ray cast queries are built on candidates() alone.
+
+
+class Broadphase:
+    NAME: str
+    members: dict[DrawableObject, None]
+
+    def __init__(self):
+        self.members = {}
+
+    def add(self, sprite: DrawableObject):
+        self.members[sprite] = None
+
+    def remove(self, sprite: DrawableObject):
+        del self.members[sprite]
+
+    def move(self, sprite: DrawableObject, rect_a: pg.Rect, rect_b: pg.Rect):
+        raise NotImplementedError
+
+    def candidates(self, rect: pg.Rect) -> Iterable[DrawableObject]:
+        raise NotImplementedError
+
+    def query(self, rect: pg.Rect) -> list[tuple[DrawableObject, tuple[int, int]]]:
+        ret = {}
+        for other in self.candidates(rect):
+            if other in ret:
+                continue
+            shift = torus_shift(rect, other.rect)
+            if rect.move(shift).colliderect(other.rect):
+                ret[other] = shift
+        return list(ret.items())
+
+    def within_radius(
+        self,
+        pos: Vector2,
+        radius: float,
+        predicate: Callable[[DrawableObject], bool] | None = None,
+    ) -> list[tuple[DrawableObject, Vector2]]:
+        """Sprites with pos_xy within radius, with their torus delta from pos."""
+        rect = pg.Rect(pos.x - radius, pos.y - radius, 2 * radius + 1, 2 * radius + 1)
+        ret = {}
+        for other in self.candidates(rect):
+            if other in ret or (predicate is not None and not predicate(other)):
+                continue
+            delta = torus_delta(pos, other.pos_xy)
+            if delta.length_squared() <= radius**2:
+                ret[other] = delta
+        return list(ret.items())
+
+    def nearest(
+        self,
+        pos: Vector2,
+        k: int = 1,
+        predicate: Callable[[DrawableObject], bool] | None = None,
+    ) -> list[tuple[DrawableObject, Vector2]]:
+        # grow the search radius until k sprites are found or the whole torus
+        # is covered
+        max_radius = math.hypot(CONFIG.WORLD_WIDTH, CONFIG.WORLD_HEIGHT) / 2
+        radius = NEAREST_START_RADIUS
+        while True:
+            found = self.within_radius(pos, min(radius, max_radius), predicate)
+            if len(found) >= k or radius >= max_radius:
+                found.sort(key=lambda item: item[1].length_squared())
+                return found[:k]
+            radius *= 2
+
+    def ray_cast(
+        self,
+        origin: Vector2,
+        direction: Vector2,
+        length: float,
+        predicate: Callable[[DrawableObject], bool] | None = None,
+    ) -> tuple[DrawableObject, float] | None:
+        """First sprite whose mask the segment hits, and the distance to it."""
+        direction = direction.normalize()
+        end = origin + direction * length
+        rect = pg.Rect(
+            min(origin.x, end.x),
+            min(origin.y, end.y),
+            abs(end.x - origin.x) + 1,
+            abs(end.y - origin.y) + 1,
+        )
+        entries = []
+        seen = set()
+        for other in self.candidates(rect):
+            if other in seen or (predicate is not None and not predicate(other)):
+                continue
+            seen.add(other)
+            dx, dy = torus_shift(rect, other.rect)
+            other_rect = other.rect.move(-dx, -dy)
+            clipped = other_rect.clipline(origin, end)
+            if not clipped:
+                continue
+            t0, t1 = sorted((pg.Vector2(p) - origin) * direction for p in clipped)
+            entries.append((t0, t1, other, other_rect))
+
+        entries.sort(key=itemgetter(0))
+        best = None
+        for t0, t1, other, other_rect in entries:
+            if best is not None and t0 > best[1]:
+                break
+            t = _mask_ray_hit(other.mask, other_rect, origin, direction, t0, t1)
+            if t is not None and (best is None or t < best[1]):
+                best = other, t
+        return best
+
+    def pairs(
+        self,
+        predicate: Callable[[DrawableObject, DrawableObject], bool] | None = None,
+    ) -> list[tuple[DrawableObject, DrawableObject, tuple[int, int]]]:
+        ret = []
+        for sprite in self.members:
+            for other, shift in self.query(sprite.rect):
+                # query is symmetric, keep the side with the lower id
+                if id(sprite) < id(other) and (
+                    predicate is None or predicate(sprite, other)
+                ):
+                    ret.append((sprite, other, shift))
+        return ret
+
+
+NEAREST_START_RADIUS = 64
+
+
+def _mask_ray_hit(
+    mask: pg.Mask,
+    rect: pg.Rect,
+    origin: Vector2,
+    direction: Vector2,
+    t0: float,
+    t1: float,
+) -> float | None:
+    # march the ray in one pixel steps between its entry and exit of rect
+    w, h = mask.get_size()
+    t = max(t0 - 1, 0.0)
+    while t <= t1 + 1:
+        point = origin + direction * t
+        x = int(point.x) - rect.x
+        y = int(point.y) - rect.y
+        if 0 <= x < w and 0 <= y < h and mask.get_at((x, y)):
+            return t
+        t += 1
+    return None
+
+
+class Spatial(Broadphase):
+    # uniform grid, cells wrap around the world edges
+    NAME = "grid"
 
-class Spatial:
     def __init__(
         self,
         *sprites: DrawableObject,
-        builder: Callable,
-        subx: int,
-        suby: int,
+        builder: Callable = set,
+        subx: int = 100,
+        suby: int = 100,
     ):
+        super().__init__()
+        assert CONFIG.WORLD_WIDTH % subx == 0 and CONFIG.WORLD_HEIGHT % suby == 0
         self.subx = subx
         self.suby = suby
+        self.nx = CONFIG.WORLD_WIDTH // subx
+        self.ny = CONFIG.WORLD_HEIGHT // suby
         self.buckets: dict = defaultdict(builder)
         for sprite in sprites:
             self.add(sprite)
 
     def add(self, sprite: DrawableObject):
+        super().add(sprite)
         for bucket in self.all_buckets(sprite.rect):
             bucket.add(sprite)
 
     def remove(self, sprite: DrawableObject):
+        super().remove(sprite)
         for bucket in self.all_buckets(sprite.rect):
             bucket.remove(sprite)
 
     def move(self, sprite: DrawableObject, rect_a: pg.Rect, rect_b: pg.Rect):
-        x_start_a = rect_a.left // self.subx
-        x_end_a = rect_a.right // self.subx
-        y_start_a = rect_a.top // self.suby
-        y_end_a = rect_a.bottom // self.suby
-        x_start_b = rect_b.left // self.subx
-        x_end_b = rect_b.right // self.subx
-        y_start_b = rect_b.top // self.suby
-        y_end_b = rect_b.bottom // self.suby
         if (
-            x_start_a == x_start_b
-            and x_end_a == x_end_b
-            and y_start_a == y_start_b
-            and y_end_a == y_end_b
+            rect_a.left // self.subx == rect_b.left // self.subx
+            and rect_a.right // self.subx == rect_b.right // self.subx
+            and rect_a.top // self.suby == rect_b.top // self.suby
+            and rect_a.bottom // self.suby == rect_b.bottom // self.suby
         ):
             return
-        for x in range(x_start_a, x_end_a + 1):
-            for y in range(y_start_a, y_end_a + 1):
-                if x_start_b <= x <= x_end_b and y_start_b <= y <= y_end_b:
+        keys_a = self.keys(rect_a)
+        keys_b = self.keys(rect_b)
+        for key in keys_a - keys_b:
+            self.buckets[key].add(sprite)
+        for key in keys_b - keys_a:
+            self.buckets[key].remove(sprite)
+
+    def keys(self, rect: pg.Rect) -> set[tuple[int, int]]:
+        return {
+            (x % self.nx, y % self.ny)
+            for x in range(rect.left // self.subx, rect.right // self.subx + 1)
+            for y in range(rect.top // self.suby, rect.bottom // self.suby + 1)
+        }
+
+    def all_buckets(self, rect: pg.Rect):
+        for key in self.keys(rect):
+            yield self.buckets[key]
+
+    def candidates(self, rect: pg.Rect) -> Iterable[DrawableObject]:
+        for bucket in self.all_buckets(rect):
+            yield from bucket
+
+    def pairs(
+        self,
+        predicate: Callable[[DrawableObject, DrawableObject], bool] | None = None,
+    ) -> list[tuple[DrawableObject, DrawableObject, tuple[int, int]]]:
+        ret = {}
+        for bucket in self.buckets.values():
+            if len(bucket) < 2:
+                continue
+            bucket = sorted(bucket, key=id)
+            for i, sprite in enumerate(bucket):
+                rect = sprite.rect
+                for other in bucket[i + 1 :]:
+                    if (sprite, other) in ret or (
+                        predicate is not None and not predicate(sprite, other)
+                    ):
+                        continue
+                    shift = torus_shift(rect, other.rect)
+                    if rect.move(shift).colliderect(other.rect):
+                        ret[(sprite, other)] = shift
+        return [(a, b, shift) for (a, b), shift in ret.items()]
+
+
+class SweepAndPrune(Broadphase):
+    # sprites are kept ordered by their left edge between frames, so the
+    # re-sort after a frame of small moves is close to linear
+    NAME = "sap"
+
+    def __init__(self, *sprites: DrawableObject):
+        super().__init__()
+        self.order: list[DrawableObject] = []
+        self.proxies: list[tuple[int, int, DrawableObject, int, int]] = []
+        self.lefts: list[int] = []
+        self.max_width = 0
+        self.dirty = True
+        for sprite in sprites:
+            self.add(sprite)
+
+    def add(self, sprite: DrawableObject):
+        super().add(sprite)
+        self.order.append(sprite)
+        self.dirty = True
+
+    def remove(self, sprite: DrawableObject):
+        super().remove(sprite)
+        self.order.remove(sprite)
+        self.dirty = True
+
+    def move(self, sprite: DrawableObject, rect_a: pg.Rect, rect_b: pg.Rect):
+        self.dirty = True
+
+    def sweep(self) -> list[tuple[int, int, DrawableObject, int, int]]:
+        if not self.dirty:
+            return self.proxies
+        self.order.sort(key=lambda sprite: sprite.rect.left)
+        proxies = [
+            (sprite.rect.left, sprite.rect.right, sprite, 0, 0) for sprite in self.order
+        ]
+        # copies of sprites crossing an edge, placed on the other side
+        for sprite in self.order:
+            rect = sprite.rect
+            for dx, dy in torus_offsets(rect):
+                if dx or dy:
+                    proxies.append((rect.left + dx, rect.right + dx, sprite, dx, dy))
+        proxies.sort(key=itemgetter(0))
+        self.proxies = proxies
+        self.lefts = [proxy[0] for proxy in proxies]
+        self.max_width = max((sprite.rect.w for sprite in self.order), default=0)
+        self.dirty = False
+        return proxies
+
+    def candidates(self, rect: pg.Rect) -> Iterable[DrawableObject]:
+        proxies = self.sweep()
+        for dx, _ in torus_offsets(rect):
+            left = rect.left + dx
+            right = rect.right + dx
+            start = bisect_left(self.lefts, left - self.max_width)
+            for proxy in proxies[start:]:
+                if proxy[0] >= right:
+                    break
+                if proxy[1] > left:
+                    yield proxy[2]
+
+    def pairs(
+        self,
+        predicate: Callable[[DrawableObject, DrawableObject], bool] | None = None,
+    ) -> list[tuple[DrawableObject, DrawableObject, tuple[int, int]]]:
+        ret = {}
+        active = []
+        for proxy in self.sweep():
+            left, _, sprite, dx, dy = proxy
+            active = [other for other in active if other[1] > left]
+            rect = sprite.rect.move(dx, dy)
+            for _, _, other, other_dx, other_dy in active:
+                if other is sprite or not rect.colliderect(
+                    other.rect.move(other_dx, other_dy),
+                ):
                     continue
-                self.buckets[(x, y)].add(sprite)
-        for x in range(x_start_b, x_end_b + 1):
-            for y in range(y_start_b, y_end_b + 1):
-                if x_start_a <= x <= x_end_a and y_start_a <= y <= y_end_a:
+                if predicate is not None and not predicate(sprite, other):
                     continue
-                self.buckets[(x, y)].remove(sprite)
+                if id(sprite) < id(other):
+                    key = (sprite, other)
+                    shift = (dx - other_dx, dy - other_dy)
+                else:
+                    key = (other, sprite)
+                    shift = (other_dx - dx, other_dy - dy)
+                ret.setdefault(key, shift)
+            active.append(proxy)
+        return [(a, b, shift) for (a, b), shift in ret.items()]
 
-    def all_buckets(self, rect: pg.Rect):
-        x_start = rect.left // self.subx
-        x_end = rect.right // self.subx
-        y_start = rect.top // self.suby
-        y_end = rect.bottom // self.suby
-        for x in range(x_start, x_end + 1):
-            for y in range(y_start, y_end + 1):
-                yield self.buckets[(x, y)]
+
+class LooseQuadtree(Broadphase):
+    # one hashed grid per quadtree level; cells are loose (twice their nominal
+    # size), so a sprite lives in exactly one cell of the deepest level its
+    # size fits in, picked by its center
+    NAME = "quadtree"
+
+    def __init__(self, *sprites: DrawableObject, depth: int = 6):
+        super().__init__()
+        self.depth = depth
+        self.levels: list[dict[tuple[int, int], set]] = [
+            defaultdict(set) for _ in range(depth)
+        ]
+        self.cells: dict[DrawableObject, tuple[int, tuple[int, int]]] = {}
+        for sprite in sprites:
+            self.add(sprite)
+
+    def cell(self, rect: pg.Rect) -> tuple[int, tuple[int, int]]:
+        for level in range(self.depth - 1, 0, -1):
+            n = 2**level
+            cell_w = CONFIG.WORLD_WIDTH / n
+            cell_h = CONFIG.WORLD_HEIGHT / n
+            if rect.w <= cell_w and rect.h <= cell_h:
+                return level, (
+                    int(rect.centerx // cell_w) % n,
+                    int(rect.centery // cell_h) % n,
+                )
+        return 0, (0, 0)
+
+    def add(self, sprite: DrawableObject):
+        super().add(sprite)
+        level, key = self.cells[sprite] = self.cell(sprite.rect)
+        self.levels[level][key].add(sprite)
+
+    def remove(self, sprite: DrawableObject):
+        super().remove(sprite)
+        level, key = self.cells.pop(sprite)
+        self.levels[level][key].remove(sprite)
+
+    def move(self, sprite: DrawableObject, rect_a: pg.Rect, rect_b: pg.Rect):
+        cell = self.cell(rect_a)
+        if cell == self.cells[sprite]:
+            return
+        level, key = self.cells[sprite]
+        self.levels[level][key].remove(sprite)
+        level, key = self.cells[sprite] = cell
+        self.levels[level][key].add(sprite)
+
+    def candidates(
+        self,
+        rect: pg.Rect,
+        min_level: int = 0,
+    ) -> Iterable[DrawableObject]:
+        for level in range(min_level, self.depth):
+            cells = self.levels[level]
+            if not cells:
+                continue
+            n = 2**level
+            cell_w = CONFIG.WORLD_WIDTH / n
+            cell_h = CONFIG.WORLD_HEIGHT / n
+            xs = range(
+                math.floor(rect.left / cell_w - 0.5),
+                math.ceil(rect.right / cell_w + 0.5),
+            )
+            ys = range(
+                math.floor(rect.top / cell_h - 0.5),
+                math.ceil(rect.bottom / cell_h + 0.5),
+            )
+            for x in {x % n for x in xs}:
+                for y in {y % n for y in ys}:
+                    if (x, y) in cells:
+                        yield from cells[(x, y)]
+
+    def pairs(
+        self,
+        predicate: Callable[[DrawableObject, DrawableObject], bool] | None = None,
+    ) -> list[tuple[DrawableObject, DrawableObject, tuple[int, int]]]:
+        # a pair is looked up from the sprite in the coarser level only
+        ret = {}
+        for sprite, (level, _) in self.cells.items():
+            rect = sprite.rect
+            for other in self.candidates(rect, level):
+                if other is sprite:
+                    continue
+                key = (sprite, other) if id(sprite) < id(other) else (other, sprite)
+                if key in ret or (predicate is not None and not predicate(*key)):
+                    continue
+                shift = torus_shift(rect, other.rect)
+                if rect.move(shift).colliderect(other.rect):
+                    ret[key] = shift if key[0] is sprite else (-shift[0], -shift[1])
+        return [(a, b, shift) for (a, b), shift in ret.items()]
+
+
+BROADPHASES: dict[str, Callable[..., Broadphase]] = {
+    backend.NAME: backend for backend in (Spatial, SweepAndPrune, LooseQuadtree)
+}
@@ -1,81 +1,196 @@
 from __future__ import annotations
 
-from functools import cached_property
+from collections import OrderedDict
 
 import pygame as pg
 from pygame import Vector2
 
+from config import CONFIG
+from masks import MaskMetadata, mask_hull, mask_metadata
+from math_utils import rotate_polygon
+from postprocessing import outline
+
+
+class RotationCache:
+    # first-quadrant rotations and their outlines, keyed by (surface, base
+    # angle, outline color or None); outlines have no mask of their own
+    entries: OrderedDict[
+        tuple[CachedSurface, float, tuple[int, ...] | None],
+        tuple[pg.Surface, pg.Mask | None, int],
+    ]
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self,
+        surface: CachedSurface,
+        base: float,
+        color: tuple[int, ...] | None = None,
+    ) -> tuple[pg.Surface, pg.Mask | None]:
+        key = (surface, base, color)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0], entry[1]
+
+        self.misses += 1
+        if color is None:
+            image, mask = surface.build_rotation(base)
+        else:
+            image, mask = surface.build_outline(base, color), None
+        w, h = image.get_size()
+        nbytes = w * h * image.get_bytesize()
+        if mask is not None:
+            nbytes += (w * h + 7) // 8
+        self.entries[key] = image, mask, nbytes
+        self.size += nbytes
+        while self.size > CONFIG.ROTATION_CACHE_BUDGET and len(self.entries) > 1:
+            _, (_, _, old_nbytes) = self.entries.popitem(last=False)
+            self.size -= old_nbytes
+            self.evictions += 1
+        return image, mask
+
+    def __repr__(self):
+        return (
+            f"{len(self.entries)} rotations and outlines {self.size / 2**20:.1f}MiB "
+            f"hits:{self.hits} misses:{self.misses} evictions:{self.evictions}"
+        )
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
-def mask_centroid(mask: pg.Mask) -> Vector2:
-    x_size, y_size = mask.get_size()
-    xacc, yacc, cnt = 0, 0, 0
-    for x in range(x_size):
-        for y in range(y_size):
-            if mask.get_at((x, y)):
-                xacc += x
-                yacc += y
-                cnt += 1
-    return Vector2(xacc / cnt, yacc / cnt)
+
+ROTATION_CACHE = RotationCache()
 
 
 class CachedSurface:
-    _image_cache: list[pg.Surface]
-    _mask_cache: list[pg.Mask]
-    _centroids: list[Vector2]
+    _image: pg.Surface
+    _mask: pg.Mask
+    _metadata: dict[float, MaskMetadata]
     _no_rotation: bool
+    _hulls: dict[float, tuple[list[tuple[float, float]], list[tuple[float, float]]]]
 
     def __init__(self, image: pg.Surface, no_rotation=False):
-        if no_rotation:
-            self._image_cache = [image]
-            mask = pg.mask.from_surface(image)
-            self._mask_cache = [mask]
-            self._centroids = [mask_centroid(mask)]
-        else:
-            self._image_cache = [pg.transform.rotate(image, i) for i in range(360)]
-            self._mask_cache = [pg.mask.from_surface(im) for im in self._image_cache]
-            self._centroids = [None for mask in self._mask_cache]
+        self._image = image
+        self._mask = pg.mask.from_surface(image)
+        self._metadata = {}
         self._no_rotation = no_rotation
+        self._hulls = {}
 
-    @cached_property
+    @property
     def inertia_moment_coef(self) -> float:
-        mask = self.get_mask(0)
-        x_size, y_size = mask.get_size()
-        x2acc, xacc, y2acc, yacc, cnt = 0, 0, 0, 0, 0
-        for x in range(x_size):
-            for y in range(y_size):
-                if mask.get_at((x, y)):
-                    x2acc += x**2
-                    y2acc += y**2
-                    xacc += x
-                    yacc += y
-                    cnt += 1
-
-        return x2acc / cnt - (xacc / cnt) ** 2 + y2acc / cnt - (yacc / cnt) ** 2
-
-    def get_image(self, ang: int = 0) -> pg.Surface:
-        if self._no_rotation:
-            return self._image_cache[0]
-        else:
-            return self._image_cache[int(ang)]
+        return self.get_mask_metadata(0).inertia_moment_coef
 
-    def get_mask(self, ang: int = 0) -> pg.Mask:
-        if self._no_rotation:
-            return self._mask_cache[0]
-        else:
-            return self._mask_cache[int(ang)]
+    def set_metadata(self, metadata: MaskMetadata | list):
+        self._metadata[0] = MaskMetadata(*metadata)
 
-    def get_rect(self, ang: int = 0, **kwargs):
-        return self.get_image(ang).get_rect(**kwargs)
-
-    def get_centroid(self, ang: int = 0) -> Vector2:
+    def split_angle(self, ang: float) -> tuple[float, int]:
+        """Quantized angle as (angle within the first quadrant, quarter turns)."""
         if self._no_rotation:
-            return self._centroids[0]
-        else:
-            ret = self._centroids[ang]
-            if ret is None:
-                ret = mask_centroid(self.get_mask(ang))
-                self._centroids[ang] = ret
+            return 0, 0
+        steps = CONFIG.ROTATION_STEPS
+        step = int(ang * steps / 360) % steps
+        quarter = 4 * step // steps
+        if steps % 4 == 0:
+            return (step - quarter * steps // 4) * 360 / steps, quarter
+        return step * 360 / steps - 90 * quarter, quarter
+
+    def build_rotation(self, base: float) -> tuple[pg.Surface, pg.Mask]:
+        image = pg.transform.rotate(self._image, base)
+        mask = pg.mask.from_surface(image)
+        if base not in self._metadata:
+            self._metadata[base] = mask_metadata(mask)
+        return image, mask
+
+    def _get_base(self, base: float) -> tuple[pg.Surface, pg.Mask]:
+        if base == 0:
+            return self._image, self._mask
+        return ROTATION_CACHE.get(self, base)
+
+    def get_image(self, ang: float = 0) -> pg.Surface:
+        # other quadrants are exact pixel permutations of the cached one
+        base, quarter = self.split_angle(ang)
+        image = self._get_base(base)[0]
+        if quarter:
+            image = pg.transform.rotate(image, 90 * quarter)
+        return image
+
+    def get_mask(self, ang: float = 0) -> pg.Mask:
+        base, quarter = self.split_angle(ang)
+        if quarter:
+            return pg.mask.from_surface(self.get_image(ang))
+        return self._get_base(base)[1]
+
+    def build_outline(self, base: float, color: tuple[int, ...]) -> pg.Surface:
+        return outline(*self._get_base(base), color)
+
+    def get_outlined_image(self, ang: float, color: pg.Color) -> pg.Surface:
+        base, quarter = self.split_angle(ang)
+        image = ROTATION_CACHE.get(self, base, tuple(color))[0]
+        if quarter:
+            image = pg.transform.rotate(image, 90 * quarter)
+        return image
+
+    def get_rect(self, ang: float = 0, **kwargs):
+        base, quarter = self.split_angle(ang)
+        w, h = self._get_base(base)[0].get_size()
+        if quarter % 2:
+            w, h = h, w
+        rect = pg.Rect(0, 0, w, h)
+        if kwargs:
+            rect = rect.move_to(**kwargs)
+        return rect
+
+    def get_mask_metadata(self, ang: float = 0) -> MaskMetadata:
+        base, quarter = self.split_angle(ang)
+        # keyed by the whole quantized angle, base is within [0, 90)
+        key = base + 90 * quarter
+        ret = self._metadata.get(key)
+        if ret is not None:
             return ret
+        ret = self._metadata.get(base)
+        if ret is None:
+            ret = mask_metadata(self._get_base(base)[1])
+            self._metadata[base] = ret
+        if quarter:
+            size = self._get_base(base)[0].get_size()
+            for _ in range(quarter):
+                ret = ret.rotate_quarter(size)
+                size = size[1], size[0]
+            self._metadata[key] = ret
+        return ret
+
+    def get_hull(
+        self,
+        ang: float = 0,
+    ) -> tuple[list[tuple[float, float]], list[tuple[float, float]]]:
+        # the unrotated hull turned analytically about the centroid, at the
+        # same quantized angle as the masks
+        base, quarter = self.split_angle(ang)
+        ang = base + 90 * quarter
+        ret = self._hulls.get(ang)
+        if ret is None:
+            if 0 not in self._hulls:
+                hull = mask_hull(self._mask, self.get_mask_metadata(0).centroid)
+                self._hulls[0] = rotate_polygon(hull, 0)
+            ret = rotate_polygon(self._hulls[0][0], ang)
+            self._hulls[ang] = ret
+        return ret
+
+    def get_centroid(self, ang: float = 0) -> Vector2:
+        return Vector2(self.get_mask_metadata(ang).centroid)
 
     def scale(self, size) -> CachedSurface:
         return CachedSurface(
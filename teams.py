@@ -8,6 +8,13 @@ from consts import BLUE, CYAN, GREEN, PURPLE, RED
 if TYPE_CHECKING:
     from objects import Object
 
+NO_TEAM = 4
+
+
+def get_player_id(owner: Object) -> int | None:
+    # computed once per object, teams only depend on the owning player
+    return getattr(owner, "player_id", None)
+
 
 def check_teams(obj_a: Object, obj_b: Object) -> bool:
     if CONFIG.MODE == "all_dmg":
@@ -17,19 +24,13 @@ def check_teams(obj_a: Object, obj_b: Object) -> bool:
 
 
 def get_team(obj: Object) -> int:
-    from players import Player
-
-    obj = obj.owner
+    player_id = obj.owner_player_id
+    if player_id is None:
+        return NO_TEAM
     if CONFIG.MODE in ["pvp", "all_dmg"]:
-        if isinstance(obj, Player):
-            return obj.player_id
-        else:
-            return 4
+        return player_id
     elif CONFIG.MODE == "coop":
-        if isinstance(obj, Player):
-            return 0
-        else:
-            return 4
+        return 0
     raise NotImplementedError
 
 
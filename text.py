@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+from functools import cache
+
 import pygame as pg
 
 from config import CONFIG
 from consts import WHITE
 from display import ALL_CHANGES_DISPLAYSURF, DISPLAYSURF
+from timers import startup_timer
+
 
-fonts = {}
-for bold in [False, True]:
-    for size in range(1, 6):
-        fonts[(bold, size)] = pg.font.SysFont(
+@cache
+def get_font(bold: bool, size: int) -> pg.font.Font:
+    with startup_timer("fonts"):
+        pg.font.init()
+        return pg.font.SysFont(
             "Lucida Console",
             int((CONFIG.WORLD_HEIGHT / 50) * size),
             bold=bold,
@@ -24,5 +29,5 @@ def display_text(
     bold=False,
     size: int = 1,
 ):
-    render = fonts[(bold, size)].render(text, True, color)
+    render = get_font(bold, size).render(text, True, color)
     ALL_CHANGES_DISPLAYSURF.append(DISPLAYSURF.blit(render, pos))
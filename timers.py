@@ -63,6 +63,28 @@ def pprint(t):
 
 TIMERS: dict[str, Timer] = defaultdict(Timer)
 
+STARTUP_TIMERS: dict[str, Timer] = {}
+STARTED = perf_counter()
+
+
+def startup_timer(name: str) -> Timer:
+    if name not in STARTUP_TIMERS:
+        STARTUP_TIMERS[name] = Timer(name)
+    return STARTUP_TIMERS[name]
+
+
+def startup_report():
+    total = perf_counter() - STARTED
+    for name, t in sorted(
+        STARTUP_TIMERS.items(),
+        key=lambda x: x[1].val,
+        reverse=True,
+    ):
+        logger.info(f"startup {name}: {pprint(t.val)} ({t.val / total:.0%})")
+    other = total - sum(t.val for t in STARTUP_TIMERS.values())
+    logger.info(f"startup other: {pprint(other)} ({other / total:.0%})")
+    logger.info(f"time to first frame: {pprint(total)}")
+
 
 def timeit(name: str):
     def _timeit(fun):
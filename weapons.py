@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import math
 
+import pygame as pg
 from pygame import Vector2, Vector3
 
 from ammunition import Mine, SmallBullet, SmallMissile
@@ -13,11 +14,15 @@ from assets import (
     MissileLauncherWeaponImage,
     SingleShotWeaponImage,
 )
-from groups import ALL_COLLIDING_OBJECTS, try_and_spawn_object
+from groups import (
+    ALL_COLLIDING_OBJECTS,
+    ALL_DRAWABLE_OBJECTS,
+    ALL_WITH_UPDATE,
+    try_and_spawn_object,
+)
 from math_utils import internal_coord_to_xy
-from objects import Attached, Object, StaticDrawable
 from status import Status
-from teams import check_teams
+from teams import check_teams, get_player_id, get_team_color
 
 
 class Weapon(Status):
@@ -126,61 +131,98 @@ class Secondary:
         self.add(owner.secondary_weapon)
 
 
-class LaserShard(StaticDrawable, Attached, Object):
-    IMAGE = LaserShardImage.scale_by(0.75)
+LASER_SHARD = LaserShardImage.scale_by(0.75)
+LASER_SHARDS = 10
+LASER_STEP = LASER_SHARD.get_rect().h - 1
+LASER_RANGE = LASER_SHARDS * LASER_STEP
+
+laser_images: dict[tuple[int, ...], pg.Surface] = {}
+
+
+def laser_image(color: pg.Color) -> pg.Surface:
+    # full length beam, shards tiled up from its bottom end
+    if tuple(color) not in laser_images:
+        shard = LASER_SHARD.get_outlined_image(0, color)
+        width, height = shard.get_size()
+        image = pg.Surface((width, LASER_RANGE + 1), flags=pg.SRCALPHA)
+        for i in range(LASER_SHARDS):
+            image.blit(shard, (0, LASER_RANGE + 1 - height - i * LASER_STEP))
+        laser_images[tuple(color)] = image
+    return laser_images[tuple(color)]
+
+
+class LaserBeam(pg.sprite.Sprite):
+    # hit-scan beam, cast and drawn after its owner moved
+    image: pg.Surface
+    rect: pg.Rect
+
+    def __init__(self, weapon: LaserWeapon, rel_pos: Vector2):
+        super().__init__(ALL_WITH_UPDATE)
+        self.weapon = weapon
+        self.owner = weapon.owner
+        self.owner_player_id = get_player_id(self.owner)
+        self.rel_pos = rel_pos
+        self.priority = getattr(self.owner, "priority", 0) + 1
+
+    def render_offset(self, alpha: float) -> tuple[int, int]:
+        return self.owner.render_offset(alpha)
 
     def update(self, dt: float):
-        for obj in ALL_COLLIDING_OBJECTS.spatial.collide_with_callback(
-            self,
-            on_collision=None,
-        ):
+        if not self.weapon.firing:
+            self.remove(ALL_DRAWABLE_OBJECTS)
+            return
+
+        ang = self.owner.pos.z
+        origin = self.owner.pos_xy + internal_coord_to_xy(self.rel_pos, ang)
+        direction = internal_coord_to_xy(Vector2(0, 1), ang)
+        length = LASER_RANGE
+        hit = ALL_COLLIDING_OBJECTS.spatial.ray_cast(
+            origin,
+            direction,
+            LASER_RANGE,
+            predicate=lambda obj: obj is not self.owner,
+        )
+        if hit is not None:
+            obj, distance = hit
+            # the beam ends with the shard that hit
+            length = min(LASER_RANGE, math.ceil(distance / LASER_STEP) * LASER_STEP)
             if check_teams(self, obj) and hasattr(obj, "apply_damage"):
                 obj.apply_damage(dt / 10)
-        self.kill()
+
+        full = laser_image(get_team_color(self))
+        width, height = full.get_size()
+        beam = full.subsurface((0, height - length - 1, width, length + 1))
+        self.image = pg.transform.rotate(beam, ang)
+        self.rect = self.image.get_rect(center=origin + direction * length / 2)
+        self.add(ALL_DRAWABLE_OBJECTS)
 
 
 class LaserWeapon(Primary, Weapon):
     COOLDOWN = 0
-    AMMO_CLS = LaserShard
     AMMO = None
     icon = LaserWeaponImage.scale((10, 10))
 
-    def fire(self):
-        for i in range(10):
-            shard = self.AMMO_CLS(
-                init_rel_pos=Vector3(
-                    6,
-                    13 + (self.AMMO_CLS.IMAGE.get_rect().h - 1) * (i + 1 / 2),
-                    0,
-                ),
-                owner=self.owner,
-                base_object=self.owner,
-            )
-            if col := ALL_COLLIDING_OBJECTS.spatial.collide_with_callback(
-                shard,
-                on_collision=None,
-            ):
-                col = [c for c in col if c is not self.owner]
-                if col:
-                    break
-
-        for i in range(10):
-            shard = self.AMMO_CLS(
-                init_rel_pos=Vector3(
-                    -6,
-                    13 + (self.AMMO_CLS.IMAGE.get_rect().h - 1) * (i + 1 / 2),
-                    0,
-                ),
-                owner=self.owner,
-                base_object=self.owner,
-            )
-            if col := ALL_COLLIDING_OBJECTS.spatial.collide_with_callback(
-                shard,
-                on_collision=None,
-            ):
-                col = [c for c in col if c is not self.owner]
-                if col:
-                    break
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # updated after the beams, which use fire() of this frame
+        self.priority = getattr(self.owner, "priority", 0) + 2
+        self.firing = False
+        self.beams = [
+            LaserBeam(self, Vector2(6, 13)),
+            LaserBeam(self, Vector2(-6, 13)),
+        ]
+
+    def update(self, dt: float):
+        self.firing = False
+        super().update(dt)
+
+    def fire_logic(self):
+        self.firing = True
+
+    def kill(self):
+        for beam in self.beams:
+            beam.kill()
+        super().kill()
 
 
 class SingleShotWeapon(Primary, Weapon):